@@ -0,0 +1,74 @@
+import time
+
+
+class Budget:
+    """
+    Stopping budget shared by the solvers: an optional wall-clock limit and an
+    optional number of fitness evaluations, plus an anytime callback that
+    receives every new best-so-far solution.
+
+    A budget covers one solver call (e.g. all runs of run(runs=10)); solvers
+    call start() at the beginning, charge() after evaluating solutions, offer()
+    with candidate bests and stop their loops once exhausted() is True.
+    """
+    def __init__(self, time_limit=None, max_evaluations=None, callback=None):
+        """
+        :param time_limit: Seconds of wall-clock time, or None for no limit.
+        :param max_evaluations: Fitness evaluations (or move evaluations), or None.
+        :param callback: Called with a dict {"cost", "routes", "elapsed",
+                         "evaluations"} whenever the best-so-far improves.
+        """
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.callback = callback
+        self.start()
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.evaluations = 0
+        self.best_cost = float("inf")
+        self.stop_reason = None
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def charge(self, evaluations=1):
+        self.evaluations += evaluations
+
+    def remaining_evaluations(self):
+        if self.max_evaluations is None:
+            return None
+        return max(0, self.max_evaluations - self.evaluations)
+
+    def exhausted(self):
+        """True (and remembers why) once either limit is reached."""
+        if self.stop_reason is None:
+            if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+                self.stop_reason = "max_evaluations"
+            elif self.time_limit is not None and self.elapsed >= self.time_limit:
+                self.stop_reason = "time_limit"
+        return self.stop_reason is not None
+
+    def offer(self, cost, make_routes):
+        """
+        Reports a candidate best. The callback only fires for a new
+        best-so-far; make_routes() is called lazily to build its routes.
+        """
+        if cost < self.best_cost:
+            self.best_cost = cost
+            if self.callback is not None:
+                self.callback({
+                    "cost": float(cost),
+                    "routes": make_routes(),
+                    "elapsed": self.elapsed,
+                    "evaluations": self.evaluations,
+                })
+
+    def report(self):
+        """Budget fields added to the solver results."""
+        return {
+            "evaluations": self.evaluations,
+            "elapsed": self.elapsed,
+            "stop_reason": self.stop_reason or "completed",
+        }
@@ -0,0 +1,226 @@
+from collections import namedtuple
+
+import numpy as np
+
+DEPOT = 1  # node id of the depot
+
+# Number of giant tours evaluated per vectorized pass when solvers generate
+# solutions on the fly (e.g. Random Search).
+EVAL_BLOCK_SIZE = 256
+
+
+def evaluate_tour(cvrp, tour):
+    """
+    Cost of one giant tour, starting a new route whenever the next customer
+    would exceed the vehicle capacity.
+    :param cvrp: An instance of CVRPData.
+    :param tour: Sequence of customer ids (depot excluded).
+    :return: Total distance as a float.
+    """
+    demands = cvrp.node_demand_list
+    capacity = cvrp.capacity
+    sequence = [DEPOT]
+    current_capacity = 0
+
+    for customer in tour:
+        demand = demands[customer]
+        if current_capacity + demand > capacity:
+            sequence.append(DEPOT)
+            current_capacity = 0
+        sequence.append(customer)
+        current_capacity += demand
+    sequence.append(DEPOT)
+
+    sequence = np.asarray(sequence)
+    legs = cvrp.distances[sequence[:-1], sequence[1:]]
+    # cumsum adds the legs in route order, matching evaluate_tours bit for bit
+    return float(np.cumsum(legs, dtype=np.float64)[-1])
+
+
+def evaluate_tours(cvrp, tours):
+    """
+    Costs of many giant tours in one vectorized pass.
+    Walks the tours column by column, so the Python overhead is O(n) per batch
+    instead of O(n) per tour.
+    :param cvrp: An instance of CVRPData.
+    :param tours: 2-D integer array-like (num_tours, num_customers).
+    :return: float64 array with one cost per tour.
+    """
+    tours = np.asarray(tours, dtype=np.intp)
+    if tours.ndim != 2:
+        raise ValueError(f"Expected a 2-D array of tours, got shape {tours.shape}")
+
+    distances = cvrp.distances
+    demands = cvrp.node_demand
+    capacity = cvrp.capacity
+    num_tours = tours.shape[0]
+
+    costs = np.zeros(num_tours, dtype=np.float64)
+    loads = np.zeros(num_tours, dtype=np.int64)
+    prev = np.full(num_tours, DEPOT, dtype=np.intp)
+
+    for column in tours.T:
+        demand = demands[column]
+        loads += demand
+        overflow = loads > capacity
+        if overflow.any():
+            costs += np.where(overflow, distances[prev, DEPOT], 0.0)
+            prev = np.where(overflow, DEPOT, prev)
+            loads = np.where(overflow, demand, loads)
+        costs += distances[prev, column]
+        prev = column
+
+    costs += distances[prev, DEPOT]
+    return costs
+
+
+def split_tour(cvrp, tour):
+    """
+    Splits a giant tour into routes the same way evaluate_tour does.
+    :return: List of routes, each starting and ending at the depot.
+    """
+    demands = cvrp.node_demand_list
+    routes = []
+    route = [DEPOT]
+    current_capacity = 0
+
+    for customer in tour:
+        customer = int(customer)
+        demand = demands[customer]
+        if current_capacity + demand > cvrp.capacity:
+            route.append(DEPOT)
+            routes.append(route)
+            route = [DEPOT, customer]
+            current_capacity = demand
+        else:
+            route.append(customer)
+            current_capacity += demand
+
+    route.append(DEPOT)
+    routes.append(route)
+    return routes
+
+
+def max_route_customers(cvrp):
+    """
+    Upper bound B on the number of customers one vehicle can serve: how many
+    of the smallest demands fit into the capacity (at least 1).
+    """
+    smallest_first = np.cumsum(np.sort(cvrp.demand[1:]))
+    return max(1, int(np.searchsorted(smallest_first, cvrp.capacity, side="right")))
+
+
+def _optimal_split_labels(cvrp, tour):
+    """
+    Bellman (Prins) split of one giant tour over a bounded lookahead of
+    max_route_customers positions.
+    :return: (labels, predecessors) where labels[k] is the cheapest cost of
+             serving the first k customers and predecessors[k] the start of
+             the last route.
+    """
+    tour = np.asarray(tour, dtype=np.intp)
+    n = len(tour)
+    distances = cvrp.distances
+    demands = cvrp.node_demand[tour].tolist()
+    from_depot = distances[DEPOT, tour].tolist()
+    to_depot = distances[tour, DEPOT].tolist()
+    next_leg = distances[tour[:-1], tour[1:]].tolist()
+    capacity = cvrp.capacity
+    lookahead = max_route_customers(cvrp)
+
+    labels = [0.0] + [float("inf")] * n
+    predecessors = [0] * (n + 1)
+    for i in range(n):
+        base = labels[i]
+        load = 0
+        dist = 0.0
+        for j in range(i, min(n, i + lookahead)):
+            load += demands[j]
+            if load > capacity:
+                break
+            dist = from_depot[i] if j == i else dist + next_leg[j - 1]
+            cost = base + dist + to_depot[j]
+            if cost < labels[j + 1]:
+                labels[j + 1] = cost
+                predecessors[j + 1] = i
+    return labels, predecessors
+
+
+def optimal_split_cost(cvrp, tour):
+    """Cost of the best segmentation of one giant tour into feasible routes."""
+    labels, _ = _optimal_split_labels(cvrp, tour)
+    return float(labels[-1])
+
+
+def optimal_split_costs(cvrp, tours):
+    """
+    Batched Bellman split: the same O(n*B) dynamic program as
+    optimal_split_cost, vectorized across all tours of the batch.
+    :param tours: 2-D integer array-like (num_tours, num_customers).
+    :return: float64 array with one cost per tour.
+    """
+    tours = np.asarray(tours, dtype=np.intp)
+    if tours.ndim != 2:
+        raise ValueError(f"Expected a 2-D array of tours, got shape {tours.shape}")
+
+    num_tours, n = tours.shape
+    distances = cvrp.distances
+    demands = cvrp.node_demand[tours]
+    from_depot = distances[DEPOT, tours].astype(np.float64)
+    to_depot = distances[tours, DEPOT].astype(np.float64)
+    next_leg = distances[tours[:, :-1], tours[:, 1:]].astype(np.float64)
+    capacity = cvrp.capacity
+    lookahead = max_route_customers(cvrp)
+
+    labels = np.full((num_tours, n + 1), np.inf)
+    labels[:, 0] = 0.0
+    for i in range(n):
+        base = labels[:, i]
+        loads = np.zeros(num_tours, dtype=np.int64)
+        dists = from_depot[:, i].copy()
+        for j in range(i, min(n, i + lookahead)):
+            loads += demands[:, j]
+            feasible = loads <= capacity
+            if not feasible.any():
+                break
+            if j > i:
+                dists += next_leg[:, j - 1]
+            costs = base + dists + to_depot[:, j]
+            improve = feasible & (costs < labels[:, j + 1])
+            labels[:, j + 1] = np.where(improve, costs, labels[:, j + 1])
+    return labels[:, n]
+
+
+def optimal_split_tour(cvrp, tour):
+    """
+    Splits a giant tour into its cheapest sequence of feasible routes.
+    :return: List of routes, each starting and ending at the depot.
+    """
+    tour = [int(customer) for customer in tour]
+    _, predecessors = _optimal_split_labels(cvrp, tour)
+    routes = []
+    end = len(tour)
+    while end > 0:
+        start = predecessors[end]
+        routes.append([DEPOT] + tour[start:end] + [DEPOT])
+        end = start
+    routes.reverse()
+    return routes
+
+
+# A decoder turns a giant tour into routes: `evaluate` scores one tour,
+# `evaluate_batch` scores a 2-D array of tours and `split` returns the routes.
+Decoder = namedtuple("Decoder", ["evaluate", "evaluate_batch", "split"])
+
+DECODERS = {
+    "greedy": Decoder(evaluate_tour, evaluate_tours, split_tour),
+    "optimal": Decoder(optimal_split_cost, optimal_split_costs, optimal_split_tour),
+}
+
+
+def get_decoder(name):
+    """Looks up a giant-tour decoder by name ("greedy" or "optimal")."""
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown decoder {name!r}, expected one of {sorted(DECODERS)}") from None
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of giant-tour costs keyed by the permutation itself
+    (as a tuple, so lookups hash it once and never confuse two tours).
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._costs = OrderedDict()
+
+    def __len__(self):
+        return len(self._costs)
+
+    def evaluate(self, population, evaluate_batch):
+        """
+        Costs of a whole population; only tours not in the cache are passed
+        (once each, in one batch) to evaluate_batch.
+        :param population: List of tours.
+        :param evaluate_batch: Callable mapping a list of tours to an array of costs.
+        :return: float64 array with one cost per tour.
+        """
+        costs = np.empty(len(population), dtype=np.float64)
+        pending = {}
+        for index, individual in enumerate(population):
+            key = tuple(individual)
+            cost = self._costs.get(key)
+            if cost is None:
+                pending.setdefault(key, []).append(index)
+            else:
+                self._costs.move_to_end(key)
+                costs[index] = cost
+                self.hits += 1
+
+        if pending:
+            self.misses += len(pending)
+            new_costs = evaluate_batch([list(key) for key in pending])
+            for (key, indices), cost in zip(pending.items(), new_costs.tolist()):
+                costs[indices] = cost
+                self._costs[key] = cost
+                # duplicates inside the batch are served by the single evaluation
+                self.hits += len(indices) - 1
+            while len(self._costs) > self.maxsize:
+                self._costs.popitem(last=False)
+        return costs
+
+    def clear(self):
+        """Drops every cached cost and zeroes the hit/miss counters."""
+        self._costs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
@@ -1,133 +1,209 @@
 import random
 import numpy as np
 
+from algorithms.budget import Budget
+from algorithms.evaluation import get_decoder
+from algorithms.fitness_cache import FitnessCache
+from algorithms.instrumentation import Instrumentation
+from algorithms.stopping import StoppingRules
+from algorithms.operators import CROSSOVERS, MUTATIONS, get_operator
+from algorithms.telemetry import GenerationTelemetry
+from algorithms.warm_start import WarmStart
+
 class GeneticAlgorithmCVRP:
     """
     Genetic Algorithm for CVRP: evolves a population of routes with crossover and mutation.
     """
+    # Phase name -> method timed when instrumentation is enabled
+    INSTRUMENTED_PHASES = {
+        "selection": "tournament_selection",
+        "crossover": "crossover",
+        "mutation": "mutate",
+        "evaluation": "evaluate_population",
+        "clone_replacement": "replace_clones",
+    }
+
     def __init__(self, cvrp_data, population_size=50, generations=100,
                  crossover_prob=0.7, mutation_prob=0.1,
-                 mutation_type="swap", crossover_type="OX"):
+                 mutation_type="swap", crossover_type="OX", decoder="greedy", seed=None,
+                 cache_size=0, eliminate_clones=False,
+                 time_limit=None, max_evaluations=None, callback=None, instrument=False,
+                 telemetry=None, initial_solutions=None, elite_pool=None, stopping=None):
         self.cvrp = cvrp_data
+        self.random = random.Random(seed)
         self.population_size = population_size
         self.generations = generations
         self.crossover_prob = crossover_prob
         self.mutation_prob = mutation_prob
         self.mutation_type = mutation_type
         self.crossover_type = crossover_type
+        self.crossover_operator = get_operator(CROSSOVERS, crossover_type, "crossover")
+        self.mutation_operator = get_operator(MUTATIONS, mutation_type, "mutation")
+        # "greedy" cuts the giant tour on capacity overflow, "optimal" uses the Bellman split
+        self.decoder = get_decoder(decoder)
+        # Optional LRU memo of tour costs (off by default: hashing every tour costs
+        # more than it saves next to the batched decoder); clones are replaced by
+        # fresh random tours
+        self.fitness_cache = FitnessCache(cache_size) if cache_size else None
+        self.eliminate_clones = eliminate_clones
+        self.clones_replaced = 0
+        # Optional wall-clock / evaluation limits and best-so-far callback
+        self.budget = Budget(time_limit, max_evaluations, callback)
+        # Per-phase timers (True or an Instrumentation with profiling options)
+        self.instrumentation = Instrumentation.from_option(instrument)
+        self.instrumentation.wrap(self, self.INSTRUMENTED_PHASES)
+        # Per-generation statistics (True records arrays; or a GenerationTelemetry)
+        self.telemetry = GenerationTelemetry.from_option(telemetry)
+        # Seed solutions ("greedy", tours or routes) and optional elite pool (True or ElitePool)
+        self.warm_start = WarmStart(cvrp_data, initial_solutions, elite_pool)
+        # Early termination of stagnating runs (a StoppingRules or a dict of its kwargs)
+        self.stopping = StoppingRules.from_option(stopping)
 
     def evaluate_route(self, route):
-        total_distance = 0.0
-        current_capacity = 0
-        prev_location = 1  # depot
-
-        for customer in route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                total_distance += self.cvrp.distance_matrix[prev_location][1]
-                prev_location = 1
-                current_capacity = 0
-
-            total_distance += self.cvrp.distance_matrix[prev_location][customer]
-            prev_location = customer
-            current_capacity += demand
-
-        total_distance += self.cvrp.distance_matrix[prev_location][1]
-        return total_distance
+        return self.decoder.evaluate(self.cvrp, route)
 
     def split_into_routes(self, flat_route):
-        routes = []
-        route = [1]
-        current_capacity = 0
-
-        for customer in flat_route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                route.append(1)
-                routes.append(route)
-                route = [1, customer]
-                current_capacity = demand
-            else:
-                route.append(customer)
-                current_capacity += demand
-
-        route.append(1)
-        routes.append(route)
-        return routes
-
-    def initialize_population(self):
+        return self.decoder.split(self.cvrp, flat_route)
+
+    def initialize_population(self, seeds=()):
+        """Seed tours first (up to population_size), then random permutations."""
         customer_ids = list(self.cvrp.locations.keys())[1:]
-        population = []
-        for _ in range(self.population_size):
+        population = [list(tour) for tour in seeds[:self.population_size]]
+        for _ in range(self.population_size - len(population)):
             individual = customer_ids.copy()
-            random.shuffle(individual)
+            self.random.shuffle(individual)
             population.append(individual)
         return population
 
     def tournament_selection(self, population, fitnesses, tournament_size=2):
-        participants = random.sample(list(zip(population, fitnesses)), tournament_size)
+        participants = self.random.sample(list(zip(population, fitnesses)), tournament_size)
         participants.sort(key=lambda x: x[1])
         return participants[0][0]
 
     def crossover(self, parent1, parent2):
-        if random.random() > self.crossover_prob:
+        if self.random.random() > self.crossover_prob:
             return parent1.copy()
-
-        size = len(parent1)
-        start, end = sorted(random.sample(range(size), 2))
-        child = [None] * size
-        child[start:end+1] = parent1[start:end+1]
-        pointer = 0
-        for gene in parent2:
-            if gene not in child:
-                while child[pointer] is not None:
-                    pointer += 1
-                child[pointer] = gene
-        return child
+        return self.crossover_operator(parent1, parent2, self.random)
 
     def mutate(self, individual):
-        if random.random() < self.mutation_prob:
-            i, j = random.sample(range(len(individual)), 2)
-            individual[i], individual[j] = individual[j], individual[i]
+        if self.random.random() < self.mutation_prob:
+            self.mutation_operator(individual, self.random)
+
+    def evaluate_population(self, population):
+        if self.fitness_cache is None:
+            return self.decoder.evaluate_batch(self.cvrp, population)
+        return self.fitness_cache.evaluate(
+            population, lambda tours: self.decoder.evaluate_batch(self.cvrp, tours))
+
+    def count_unique(self, population):
+        return len(set(map(tuple, population)))
+
+    def replace_clones(self, population):
+        seen = set()
+        for index, individual in enumerate(population):
+            key = tuple(individual)
+            while key in seen:
+                individual = individual.copy()
+                self.random.shuffle(individual)
+                key = tuple(individual)
+                self.clones_replaced += 1
+            seen.add(key)
+            population[index] = individual
+        return population
+
+    def next_generation(self, population, fitnesses):
+        new_population = []
+        for _ in range(self.population_size):
+            p1 = self.tournament_selection(population, fitnesses)
+            p2 = self.tournament_selection(population, fitnesses)
+            child = self.crossover(p1, p2)
+            self.mutate(child)
+            new_population.append(child)
+        if self.eliminate_clones:
+            self.replace_clones(new_population)
+        return new_population
 
     def run(self, runs=1):
         sample_counter = 0
         best_costs = []
         best_route = None
-
-        for _ in range(runs):
-            population = self.initialize_population()
-            best_individual = min(population, key=self.evaluate_route)
-            best_cost = self.evaluate_route(best_individual)
-
-            for _ in range(self.generations):
-                fitnesses = [self.evaluate_route(ind) for ind in population]
-                new_population = []
-                for _ in range(self.population_size):
-                    p1 = self.tournament_selection(population, fitnesses)
-                    p2 = self.tournament_selection(population, fitnesses)
-                    child = self.crossover(p1, p2)
-                    self.mutate(child)
-                    new_population.append(child)
-                population = new_population
-                current_best = min(population, key=self.evaluate_route)
-                current_cost = self.evaluate_route(current_best)
+        best_overall = float("inf")
+        self.budget.start()
+        self.instrumentation.start()
+        self.reset_cache()
+        if self.telemetry is not None:
+            self.telemetry.start(runs, self.generations)
+        self.stopping.start()
+        seeds = self.warm_start.tours()
+
+        for run in range(runs):
+            if best_costs and self.budget.exhausted():
+                break
+            population = self.initialize_population(seeds)
+            fitnesses = self.evaluate_population(population)
+            self.budget.charge(len(population))
+            best_index = int(fitnesses.argmin())
+            best_individual = population[best_index]
+            best_cost = float(fitnesses[best_index])
+            self.budget.offer(best_cost, lambda: self.split_into_routes(best_individual))
+            self.stopping.start_run(best_cost)
+            if self.telemetry is not None:
+                self.telemetry.record(run, 0, fitnesses, self.count_unique(population), best_cost, self.budget)
+
+            for generation in range(1, self.generations + 1):
+                if self.budget.exhausted():
+                    break
+                population = self.next_generation(population, fitnesses)
+                # One batched evaluation per generation, reused for selection
+                fitnesses = self.evaluate_population(population)
+                self.budget.charge(len(population))
+                current_index = int(fitnesses.argmin())
+                current_cost = float(fitnesses[current_index])
                 sample_counter += len(population)
 
                 if current_cost < best_cost:
                     best_cost = current_cost
-                    best_individual = current_best
-
+                    best_individual = population[current_index]
+                    self.budget.offer(best_cost, lambda: self.split_into_routes(best_individual))
+                if self.telemetry is not None:
+                    self.telemetry.record(run, generation, fitnesses, self.count_unique(population),
+                                          best_cost, self.budget)
+                diversity = (self.count_unique(population) / self.population_size
+                             if self.stopping.needs_diversity else None)
+                if self.stopping.check(generation, best_cost, diversity):
+                    break
+
+            self.stopping.end_run(self.budget)
             best_costs.append(best_cost)
-            best_route = best_individual.copy()
+            if best_cost < best_overall:
+                best_overall = best_cost
+                best_route = best_individual.copy()
 
         print(f"Total samples evaluated: {sample_counter}")
         arr = np.array(best_costs)
+        split_routes = self.split_into_routes(best_route)
+        self.warm_start.record(split_routes)
         return {
             "best": float(arr.min()),
             "worst": float(arr.max()),
             "avg": float(arr.mean()),
             "std": float(arr.std()),
 
-            "split_routes": self.split_into_routes(best_route)
+            "split_routes": split_routes,
+            **self.cache_stats(),
+            **self.budget.report(),
+            **self.stopping.report(self.budget),
+            **self.instrumentation.report(),
+            **(self.telemetry.report() if self.telemetry is not None else {})
         }
+
+    def reset_cache(self):
+        """Empties the fitness cache and the clone counter at the start of run()."""
+        if self.fitness_cache is not None:
+            self.fitness_cache.clear()
+        self.clones_replaced = 0
+
+    def cache_stats(self):
+        stats = self.fitness_cache.stats() if self.fitness_cache else {"cache_hits": 0, "cache_misses": 0}
+        stats["clones_replaced"] = self.clones_replaced
+        return stats
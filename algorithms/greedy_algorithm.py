@@ -1,3 +1,5 @@
+import numpy as np
+
 from cvrp_solver import cvrp
 
 class GreedyCVRP:
@@ -6,12 +8,35 @@ class GreedyCVRP:
     that can be served without exceeding vehicle capacity.
     """
 
-    def __init__(self, cvrp_data):
+    def __init__(self, cvrp_data, neighbors=20):
         """
         Initialize the Greedy algorithm with CVRP data.
         :param cvrp_data: An instance of CVRPData.
+        :param neighbors: Size of the nearest-neighbor candidate lists consulted
+                          before falling back to a scan of all customers.
         """
         self.cvrp = cvrp_data
+        self.neighbors = neighbors
+
+    def nearest_feasible(self, current_location, current_capacity, candidates, unvisited, unvisited_mask):
+        """
+        Nearest unvisited customer that still fits in the vehicle, or None.
+        The sorted candidate list is tried first; only if none of its
+        customers qualifies are all customers scanned (vectorized).
+        :param unvisited: bytearray flag per node id.
+        :param unvisited_mask: Boolean NumPy view of the same buffer.
+        """
+        demands = self.cvrp.node_demand_list
+        free = self.cvrp.capacity - current_capacity
+        for customer in candidates[current_location]:
+            if unvisited[customer] and demands[customer] <= free:
+                return customer
+
+        feasible = np.flatnonzero(unvisited_mask & (self.cvrp.node_demand <= free))
+        if not len(feasible):
+            return None
+        distances = self.cvrp.distances.row(current_location)[feasible]
+        return int(feasible[distances.argmin()])
 
     def run(self):
         """
@@ -20,49 +45,48 @@ class GreedyCVRP:
                  routes is a list of routes (each a list of node IDs including start/end at 1).
                  total_distance is the total traveled distance.
         """
-        unvisited = set(self.cvrp.locations.keys()) - {1}  # Exclude depot (1)
+        candidates = self.cvrp.nearest_neighbors(self.neighbors).tolist()
+        # bytearray for fast scalar checks, shared with a NumPy view for full scans
+        unvisited = bytearray(self.cvrp.num_nodes + 1)
+        unvisited_mask = np.frombuffer(unvisited, dtype=np.uint8).view(bool)
+        unvisited_mask[2:] = True  # Exclude depot (1)
+        remaining = self.cvrp.num_nodes - 1
         routes = []
         total_distance = 0.0
 
-        while unvisited:
+        while remaining:
             route = []
             current_capacity = 0
             current_location = 1  # Start at depot
             route_distance = 0.0
 
             while True:
-                nearest_customer = None
-                nearest_distance = float('inf')
                 # Find nearest feasible customer
-                for customer in unvisited:
-                    demand = self.cvrp.demands[customer]
-                    if current_capacity + demand <= self.cvrp.capacity:
-                        distance = self.cvrp.distance_matrix[current_location, customer]
-                        if distance < nearest_distance:
-                            nearest_distance = distance
-                            nearest_customer = customer
+                nearest_customer = self.nearest_feasible(
+                    current_location, current_capacity, candidates, unvisited, unvisited_mask)
 
                 if nearest_customer is None:
                     # No feasible customer remaining, return to depot
-                    route_distance += self.cvrp.distance_matrix[current_location, 1]
+                    route_distance += self.cvrp.distances.pair(current_location, 1)
                     break
 
                 # Visit the nearest customer
                 route.append(nearest_customer)
                 current_capacity += self.cvrp.demands[nearest_customer]
-                route_distance += nearest_distance
-                unvisited.remove(nearest_customer)
+                route_distance += self.cvrp.distances.pair(current_location, nearest_customer)
+                unvisited_mask[nearest_customer] = False
+                remaining -= 1
                 current_location = nearest_customer
 
-                if not unvisited:
+                if not remaining:
                     # All customers visited, return to depot
-                    route_distance += self.cvrp.distance_matrix[current_location, 1]
+                    route_distance += self.cvrp.distances.pair(current_location, 1)
                     break
 
             routes.append([1] + route + [1])
             total_distance += route_distance
 
-        return routes, total_distance
+        return routes, float(total_distance)
 
 # Run the Greedy Algorithm
 greedy_solver = GreedyCVRP(cvrp)
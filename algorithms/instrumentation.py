@@ -0,0 +1,160 @@
+import contextlib
+import cProfile
+import pstats
+import time
+import tracemalloc
+
+# Shared no-op context returned by phase() while instrumentation is disabled
+_NO_PHASE = contextlib.nullcontext()
+
+
+class _PhaseTimer:
+    __slots__ = ("instrumentation", "phase", "start")
+
+    def __init__(self, instrumentation, phase):
+        self.instrumentation = instrumentation
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.add(self.phase, time.perf_counter() - self.start)
+
+
+class _TimedMethod:
+    """Callable replacing a bound method; a class (not a closure) so solvers stay picklable."""
+    def __init__(self, instrumentation, phase, method):
+        self.instrumentation = instrumentation
+        self.phase = phase
+        self.method = method
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.method(*args, **kwargs)
+        finally:
+            self.instrumentation.add(self.phase, time.perf_counter() - start)
+
+
+class Instrumentation:
+    """
+    Per-phase timers and call counters for the solvers, with optional
+    cProfile and tracemalloc sessions around a whole run.
+
+    Solvers hand their hot methods to wrap() and mark inline blocks with
+    phase(). While disabled, wrap() leaves the methods untouched and phase()
+    returns a shared no-op context, so the only cost is an attribute lookup.
+    """
+    def __init__(self, enabled=True, profile=False, trace_memory=False, profile_limit=20):
+        """
+        :param enabled: Collect per-phase timers and counters.
+        :param profile: Also run cProfile over the whole run.
+        :param trace_memory: Also record the peak traced memory of the run.
+        :param profile_limit: Functions listed in the profile, by cumulative time.
+        """
+        self.enabled = enabled or profile or trace_memory
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_limit = profile_limit
+        self.profiler = None
+        self.reset()
+
+    @classmethod
+    def from_option(cls, option):
+        """Accepts an Instrumentation, True (timers only) or a false value (disabled)."""
+        if isinstance(option, cls):
+            return option
+        return cls(enabled=bool(option))
+
+    def reset(self):
+        self.seconds = {}
+        self.calls = {}
+        self.run_start = None
+        self.total = 0.0
+        self.profile_stats = None
+        self.peak_memory = None
+
+    def add(self, phase, seconds):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count(self, counter, n=1):
+        """Bumps a plain counter (no timing)."""
+        if self.enabled:
+            self.calls[counter] = self.calls.get(counter, 0) + n
+
+    def phase(self, name):
+        """Context manager timing an inline block as phase `name`."""
+        return _PhaseTimer(self, name) if self.enabled else _NO_PHASE
+
+    def wrap(self, obj, phases):
+        """
+        Times methods of one solver instance.
+        :param obj: The solver.
+        :param phases: {phase name: method name}.
+        """
+        if not self.enabled:
+            return
+        for phase, name in phases.items():
+            setattr(obj, name, _TimedMethod(self, phase, getattr(obj, name)))
+
+    def start(self):
+        """Resets the data and opens the optional profiling sessions of one run."""
+        if not self.enabled:
+            return
+        self.reset()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.run_start = time.perf_counter()
+
+    def stop(self):
+        if self.run_start is None:
+            return
+        self.total = time.perf_counter() - self.run_start
+        self.run_start = None
+        if self.profiler is not None:
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler).sort_stats("cumulative")
+            self.profile_stats = [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "tottime": tottime,
+                    "cumtime": cumtime,
+                }
+                for (filename, line, name), (_, calls, tottime, cumtime, _) in
+                ((func, stats.stats[func]) for func in stats.fcn_list[:self.profile_limit])
+            ]
+            self.profiler = None
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def report(self):
+        """
+        Stops the run and returns the fields added to the solver results:
+        {} while disabled, else {"instrumentation": {...}}.
+        """
+        if not self.enabled:
+            return {}
+        self.stop()
+        timed = sum(self.seconds.values())
+        data = {
+            "total_seconds": self.total,
+            "phases": {
+                phase: {"seconds": seconds, "calls": self.calls[phase]}
+                for phase, seconds in self.seconds.items()
+            },
+            # Loop bookkeeping and anything not attributed to a phase
+            "other_seconds": max(0.0, self.total - timed),
+            "counters": {name: calls for name, calls in self.calls.items() if name not in self.seconds},
+        }
+        if self.profile_stats is not None:
+            data["profile"] = self.profile_stats
+        if self.peak_memory is not None:
+            data["peak_memory_bytes"] = self.peak_memory
+        return {"instrumentation": data}
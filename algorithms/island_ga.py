@@ -0,0 +1,237 @@
+import math
+import random
+
+import numpy as np
+
+from algorithms.budget import Budget
+from algorithms.evaluation import get_decoder
+from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
+from algorithms.route_solution import RouteSolution
+from algorithms.warm_start import WarmStart
+from algorithms.workers import receive, serve, start_worker, stop_workers
+
+# Migration topologies: "ring" sends island i's elites to island i + 1,
+# "random" sends them to a randomly chosen other island every epoch.
+TOPOLOGIES = ("ring", "random")
+
+
+class Island:
+    """
+    One sub-population of the island model, evolved by its own
+    GeneticAlgorithmCVRP (own operators, probabilities and RNG).
+    """
+    def __init__(self, cvrp_data, ga_params, seed, initial_tours=()):
+        self.ga = GeneticAlgorithmCVRP(cvrp_data, seed=seed, **ga_params)
+        self.population = self.ga.initialize_population(initial_tours)
+        self.fitnesses = self.ga.evaluate_population(self.population)
+        best_index = int(self.fitnesses.argmin())
+        self.best_cost = float(self.fitnesses[best_index])
+        self.best_individual = self.population[best_index].copy()
+        self.samples = len(self.population)
+
+    def receive(self, immigrants):
+        """Replaces the worst individuals with the incoming elites."""
+        if not immigrants:
+            return
+        worst = np.argsort(self.fitnesses)[::-1][:len(immigrants)]
+        for index, individual in zip(worst, immigrants):
+            self.population[index] = list(individual)
+        self.fitnesses = self.ga.evaluate_population(self.population)
+        self.samples += len(self.population)
+
+    def evolve(self, generations):
+        for _ in range(generations):
+            self.population = self.ga.next_generation(self.population, self.fitnesses)
+            self.fitnesses = self.ga.evaluate_population(self.population)
+            self.samples += len(self.population)
+
+            current_index = int(self.fitnesses.argmin())
+            if self.fitnesses[current_index] < self.best_cost:
+                self.best_cost = float(self.fitnesses[current_index])
+                self.best_individual = self.population[current_index].copy()
+
+    def elites(self, count):
+        return [self.population[i].copy() for i in np.argsort(self.fitnesses)[:count]]
+
+    def epoch(self, immigrants, generations, migrants):
+        """
+        Integrate immigrants, evolve, and report
+        (best cost, best individual, emigrants, evaluations so far).
+        """
+        self.receive(immigrants)
+        self.evolve(generations)
+        return self.best_cost, self.best_individual, self.elites(migrants), self.samples
+
+
+def _island_worker(conn, cvrp_data, ga_params, seed, initial_tours):
+    """Worker process owning one Island; serves epochs until it receives None."""
+    serve(conn,
+          build=lambda: Island(cvrp_data, ga_params, seed, initial_tours),
+          handle=lambda island, message: island.epoch(*message),
+          finish=lambda island: island.samples)
+
+
+class IslandGeneticAlgorithmCVRP:
+    """
+    Island-model Genetic Algorithm for CVRP: several sub-populations evolve in
+    parallel worker processes and exchange elite individuals every
+    `migration_interval` generations.
+    """
+    def __init__(self, cvrp_data, islands=4, generations=100, migration_interval=10,
+                 migrants=2, topology="ring", island_params=None, use_processes=True,
+                 seed=None, time_limit=None, max_evaluations=None, callback=None,
+                 initial_solutions=None, elite_pool=None, **ga_params):
+        """
+        :param cvrp_data: An instance of CVRPData.
+        :param islands: Number of sub-populations (ignored if island_params is given).
+        :param generations: Generations evolved by every island.
+        :param migration_interval: Generations between two migrations.
+        :param migrants: Elite individuals each island sends per migration.
+        :param topology: One of TOPOLOGIES.
+        :param island_params: Optional list of per-island GeneticAlgorithmCVRP
+                              kwargs overriding ga_params, e.g. to give islands
+                              different operators or probabilities.
+        :param use_processes: Evolve each island in its own process; False
+                              steps them in this process (same results).
+        :param seed: Seed for island seeds and random migration targets.
+        :param time_limit: Optional wall-clock limit in seconds, checked at
+                           every migration.
+        :param max_evaluations: Optional evaluation limit, checked at every migration.
+        :param callback: Optional callable receiving every new best-so-far.
+        :param initial_solutions: Optional seeds ("greedy", tours or routes)
+                                  placed in every island's first population.
+        :param elite_pool: Optional ElitePool (or True for the instance's
+                           default pool) read for seeds and updated at the end.
+        :param ga_params: GeneticAlgorithmCVRP kwargs shared by all islands.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+        self.cvrp = cvrp_data
+        self.generations = generations
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.topology = topology
+        self.use_processes = use_processes
+        self.random = random.Random(seed)
+        self.budget = Budget(time_limit, max_evaluations, callback)
+        self.warm_start = WarmStart(cvrp_data, initial_solutions, elite_pool)
+        overrides = island_params or [{} for _ in range(islands)]
+        self.island_params = [{**ga_params, **params} for params in overrides]
+        for params in self.island_params:
+            # Fail here on bad settings rather than inside a worker process
+            GeneticAlgorithmCVRP(cvrp_data, **params)
+        # Islands may use different decoders: a tour is split by the decoder
+        # of the island that produced it
+        self.decoders = [get_decoder(params.get("decoder", "greedy")) for params in self.island_params]
+
+    def split_into_routes(self, flat_route, island=0):
+        return self.decoders[island].split(self.cvrp, flat_route)
+
+    def candidate(self, island, individual):
+        """
+        Routes of an island's best tour and their distance. Every island is
+        ranked by this distance, whatever its decoder scores tours with.
+        """
+        routes = self.split_into_routes(individual, island)
+        return RouteSolution(self.cvrp, routes).compute_cost(), routes
+
+    def migration_targets(self):
+        """Destination island of every island's emigrants for one epoch."""
+        count = len(self.island_params)
+        if self.topology == "ring" or count == 1:
+            return [(i + 1) % count for i in range(count)]
+        return [self.random.choice([j for j in range(count) if j != i]) for i in range(count)]
+
+    def _start_islands(self, seeds, initial_tours):
+        if not self.use_processes:
+            islands = [Island(self.cvrp, params, seed, initial_tours)
+                       for params, seed in zip(self.island_params, seeds)]
+            return islands, None
+        workers = [start_worker(_island_worker, self.cvrp, params, seed, initial_tours)
+                   for params, seed in zip(self.island_params, seeds)]
+        return [conn for conn, _ in workers], [process for _, process in workers]
+
+    def _run_once(self, initial_tours):
+        count = len(self.island_params)
+        seeds = [self.random.getrandbits(63) for _ in range(count)]
+        handles, processes = self._start_islands(seeds, initial_tours)
+        try:
+            return self._evolve_islands(handles, processes)
+        finally:
+            if processes is not None:
+                stop_workers(processes)
+
+    def _evolve_islands(self, handles, processes):
+        count = len(handles)
+        immigrants = [[] for _ in range(count)]
+        best_cost, best_routes = float("inf"), None
+        island_bests = [None] * count
+        charged = 0
+
+        remaining = self.generations
+        for epoch in range(max(1, math.ceil(self.generations / self.migration_interval))):
+            if epoch and self.budget.exhausted():
+                break
+            generations = min(self.migration_interval, remaining)
+            remaining -= generations
+            if processes is None:
+                reports = [island.epoch(immigrants[i], generations, self.migrants)
+                           for i, island in enumerate(handles)]
+            else:
+                for i, conn in enumerate(handles):
+                    conn.send((immigrants[i], generations, self.migrants))
+                reports = [receive(conn) for conn in handles]
+
+            immigrants = [[] for _ in range(count)]
+            for source, target in enumerate(self.migration_targets()):
+                immigrants[target].extend(reports[source][2])
+            samples = sum(report[3] for report in reports)
+            self.budget.charge(samples - charged)
+            charged = samples
+            for island, (cost, individual, _, _) in enumerate(reports):
+                if cost == island_bests[island]:
+                    continue  # this island has no new best
+                island_bests[island] = cost
+                distance, routes = self.candidate(island, individual)
+                if distance < best_cost:
+                    best_cost, best_routes = distance, routes
+            self.budget.offer(best_cost, lambda: best_routes)
+
+        if processes is None:
+            samples = sum(island.samples for island in handles)
+        else:
+            for conn in handles:
+                conn.send(None)
+            samples = sum(receive(conn) for conn in handles)
+        return best_cost, best_routes, samples
+
+    def run(self, runs=1):
+        sample_counter = 0
+        best_costs = []
+        split_routes = None
+        best_overall = float("inf")
+        self.budget.start()
+        initial_tours = self.warm_start.tours()
+
+        for _ in range(runs):
+            if best_costs and self.budget.exhausted():
+                break
+            best_cost, routes, samples = self._run_once(initial_tours)
+            sample_counter += samples
+            best_costs.append(best_cost)
+            if best_cost < best_overall:
+                best_overall = best_cost
+                split_routes = routes
+
+        print(f"Total samples evaluated: {sample_counter}")
+        arr = np.array(best_costs)
+        self.warm_start.record(split_routes)
+        return {
+            "best": float(arr.min()),
+            "worst": float(arr.max()),
+            "avg": float(arr.mean()),
+            "std": float(arr.std()),
+
+            "split_routes": split_routes,
+            **self.budget.report()
+        }
@@ -0,0 +1,124 @@
+import time
+from collections import deque
+
+from algorithms.route_solution import RouteSolution
+
+# Moves tried by LocalSearch, in this order for every customer
+LOCAL_SEARCH_MOVES = ("two_opt", "or_opt", "relocate", "swap", "two_opt_star")
+
+# Minimum gain for a move to count as an improvement (guards against
+# floating-point noise cycling between equivalent solutions)
+IMPROVEMENT_EPS = 1e-9
+
+
+class LocalSearch:
+    """
+    Post-optimizer polishing any route set to a local optimum of 2-opt,
+    Or-opt, relocate, swap and 2-opt* moves.
+
+    Moves are granular: for a customer u only moves that make u adjacent to
+    one of its nearest neighbors are tried, and the first improving move is
+    applied. Don't-look bits keep customers whose neighborhood has not
+    changed out of the queue; applying a move wakes up every customer of the
+    routes it touched.
+    """
+    def __init__(self, cvrp_data, neighbors=10, moves=LOCAL_SEARCH_MOVES, max_segment=3, time_limit=None):
+        """
+        :param cvrp_data: An instance of CVRPData.
+        :param neighbors: Length of the neighbor lists.
+        :param moves: Subset of LOCAL_SEARCH_MOVES to use.
+        :param max_segment: Longest segment moved by Or-opt (segments of one
+                            customer are relocate moves).
+        :param time_limit: Optional wall-clock limit in seconds.
+        """
+        unknown = set(moves) - set(LOCAL_SEARCH_MOVES)
+        if unknown:
+            raise ValueError(f"Unknown local search moves {sorted(unknown)}, expected {LOCAL_SEARCH_MOVES}")
+        self.cvrp = cvrp_data
+        self.neighbors = neighbors
+        self.moves = [move for move in LOCAL_SEARCH_MOVES if move in moves]
+        self.max_segment = max_segment
+        self.time_limit = time_limit
+
+    def candidates(self, solution, u, v):
+        """
+        Moves placing customer u next to customer v, as
+        (delta function, apply function, arguments, touched routes).
+        """
+        ru, pu = solution.route_of[u], solution.pos_of[u]
+        rv, pv = solution.route_of[v], solution.pos_of[v]
+        for move in self.moves:
+            if move == "two_opt":
+                if ru == rv:
+                    i, j = min(pu, pv), max(pu, pv)
+                    yield solution.delta_two_opt, solution.apply_two_opt, (ru, i + 1, j), (ru,)
+                    yield solution.delta_two_opt, solution.apply_two_opt, (ru, i, j - 1), (ru,)
+            elif move == "or_opt":
+                for length in range(2, self.max_segment + 1):
+                    for j in (pv + 1, pv):
+                        for reverse in (False, True):
+                            yield (solution.delta_or_opt, solution.apply_or_opt,
+                                   (ru, pu, length, rv, j, reverse), (ru, rv))
+            elif move == "relocate":
+                for j in (pv + 1, pv):
+                    yield solution.delta_relocate, solution.apply_relocate, (ru, pu, rv, j), (ru, rv)
+            elif move == "swap":
+                for j in (pv + 1, pv - 1):
+                    if 0 <= j < len(solution.routes[rv]):
+                        yield solution.delta_swap, solution.apply_swap, (ru, pu, rv, j), (ru, rv)
+            elif ru != rv:  # two_opt_star
+                yield solution.delta_two_opt_star, solution.apply_two_opt_star, (ru, pu, rv, pv - 1), (ru, rv)
+                yield solution.delta_two_opt_star, solution.apply_two_opt_star, (ru, pu - 1, rv, pv), (ru, rv)
+
+    def find_move(self, solution, u, neighbor_list):
+        """First improving move around customer u, or None."""
+        for v in neighbor_list:
+            for delta_fn, apply_fn, args, routes in self.candidates(solution, u, v):
+                delta = delta_fn(*args)
+                if delta is not None and delta < -IMPROVEMENT_EPS:
+                    return apply_fn, args + (delta,), routes
+        return None
+
+    def improve(self, routes):
+        """
+        Applies improving moves until no customer has one left.
+        :param routes: Iterable of routes (lists of node ids, depot optional).
+        :return: Dict with 'split_routes' (depot included), 'cost',
+                 'initial_cost', 'applied_moves' and 'elapsed'.
+        """
+        start = time.perf_counter()
+        solution = RouteSolution(self.cvrp, routes)
+        initial_cost = solution.cost
+        neighbor_lists = self.cvrp.nearest_neighbors(self.neighbors).tolist()
+
+        customers = solution.giant_tour()
+        active = [False] * (self.cvrp.num_nodes + 1)
+        for customer in customers:
+            active[customer] = True
+        queue = deque(customers)
+        applied_moves = 0
+
+        while queue:
+            if self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+                break
+            u = queue.popleft()
+            active[u] = False
+            move = self.find_move(solution, u, neighbor_lists[u])
+            if move is None:
+                continue
+            apply_fn, args, routes_touched = move
+            woken = [c for r in set(routes_touched) for c in solution.routes[r]]
+            apply_fn(*args)
+            applied_moves += 1
+            for customer in woken:
+                if not active[customer]:
+                    active[customer] = True
+                    queue.append(customer)
+
+        return {
+            "split_routes": solution.as_routes(),
+            "cost": solution.compute_cost(),
+            "initial_cost": initial_cost,
+            "applied_moves": applied_moves,
+            "elapsed": time.perf_counter() - start,
+        }
@@ -0,0 +1,230 @@
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
+
+
+class NumpyGeneticAlgorithmCVRP(GeneticAlgorithmCVRP):
+    """
+    Genetic Algorithm for CVRP on a NumPy population engine.
+
+    The population lives in a preallocated (2, population_size, n) int array
+    used as a double buffer: every generation writes its children into the
+    idle half. Tournament selection, OX crossover and all mutations are
+    vectorized over the whole population; PMX and ERX children are still
+    built row by row with the list operators. Settings and results match
+    GeneticAlgorithmCVRP, except that there is no fitness cache (the whole
+    buffer is scored in one batched call instead).
+    """
+    INSTRUMENTED_PHASES = {
+        "selection": "select_parents",
+        "crossover": "crossover_batch",
+        "mutation": "mutate_batch",
+        "evaluation": "evaluate_buffer",
+    }
+
+    def __init__(self, cvrp_data, tournament_size=2, cache_size=0, **ga_params):
+        """
+        :param cvrp_data: An instance of CVRPData.
+        :param tournament_size: Individuals competing in every tournament.
+        :param cache_size: Must be 0: the NumPy engine has no fitness cache.
+        :param ga_params: GeneticAlgorithmCVRP keyword arguments.
+        """
+        if cache_size:
+            raise ValueError("NumpyGeneticAlgorithmCVRP scores whole buffers and has no fitness cache, "
+                             f"got cache_size={cache_size!r} (use 0)")
+        super().__init__(cvrp_data, cache_size=0, **ga_params)
+        self.tournament_size = tournament_size
+        self.np_random = np.random.default_rng(self.random.getrandbits(64))
+        self.customer_ids = np.array(list(self.cvrp.locations.keys())[1:], dtype=np.int32)
+
+    def initialize_buffers(self, seeds=()):
+        size = len(self.customer_ids)
+        buffers = np.empty((2, self.population_size, size), dtype=np.int32)
+        buffers[0] = self.np_random.permuted(np.tile(self.customer_ids, (self.population_size, 1)), axis=1)
+        seeds = seeds[:self.population_size]
+        if seeds:
+            buffers[0, :len(seeds)] = seeds
+        # Scratch arrays reused by every generation: the two batches of
+        # parents, OX's taken-gene flags and the crossed children
+        self.parent_buffers = np.empty((2, self.population_size, size), dtype=np.int32)
+        self.taken = np.empty((self.population_size, self.cvrp.num_nodes + 1), dtype=bool)
+        self.crossed_children = np.empty((self.population_size, size), dtype=np.int32)
+        return buffers
+
+    def evaluate_buffer(self, population):
+        return self.decoder.evaluate_batch(self.cvrp, population)
+
+    def count_unique(self, population):
+        return len({row.tobytes() for row in population})
+
+    def replace_clones_batch(self, population):
+        """Reshuffles repeated rows in place until all rows differ (as replace_clones)."""
+        while True:
+            _, first = np.unique(population, axis=0, return_index=True)
+            clones = np.ones(len(population), dtype=bool)
+            clones[first] = False
+            rows = np.flatnonzero(clones)
+            if not len(rows):
+                return
+            population[rows] = self.np_random.permuted(population[rows], axis=1)
+            self.clones_replaced += len(rows)
+
+    def select_parents(self, fitnesses, count):
+        """
+        Vectorized tournament selection: indices of `count` winners. Like
+        tournament_selection, every tournament draws distinct individuals
+        (the smallest of a row of random keys).
+        """
+        keys = self.np_random.random((count, len(fitnesses)))
+        entrants = np.argpartition(keys, self.tournament_size - 1, axis=1)[:, :self.tournament_size]
+        return entrants[np.arange(count), fitnesses[entrants].argmin(axis=1)]
+
+    def _cut_points(self, rows, size):
+        first = self.np_random.integers(size, size=rows)
+        second = (first + self.np_random.integers(1, size, size=rows)) % size
+        return np.minimum(first, second), np.maximum(first, second)
+
+    def order_crossover_batch(self, parents1, parents2, out, taken=None):
+        """
+        OX for every row at once, same definition as operators.order_crossover.
+        :param taken: Optional (rows, num_nodes + 1) bool scratch array.
+        """
+        rows, size = parents1.shape
+        start, end = self._cut_points(rows, size)
+        positions = np.arange(size)
+        segment = (positions >= start[:, None]) & (positions <= end[:, None])
+
+        row_index = np.broadcast_to(np.arange(rows)[:, None], (rows, size))
+        if taken is None:
+            taken = np.zeros((rows, self.cvrp.num_nodes + 1), dtype=bool)
+        else:
+            taken.fill(False)
+        taken[row_index[segment], parents1[segment]] = True
+        keep = ~taken[row_index, parents2]
+
+        # Boolean assignment walks rows in order and every row keeps exactly
+        # size - segment length genes, so the fill lines up row by row.
+        out[segment] = parents1[segment]
+        out[~segment] = parents2[keep]
+
+    def crossover_batch(self, parents1, parents2, out):
+        crossed = self.np_random.random(len(out)) < self.crossover_prob
+        out[~crossed] = parents1[~crossed]
+        rows = np.flatnonzero(crossed)
+        if not len(rows):
+            return
+        if self.crossover_type == "OX":
+            children = self.crossed_children[:len(rows)]
+            self.order_crossover_batch(parents1[rows], parents2[rows], children, self.taken[:len(rows)])
+            out[rows] = children
+        else:
+            for r in rows:
+                out[r] = self.crossover_operator(parents1[r].tolist(), parents2[r].tolist(), self.random)
+
+    def mutate_batch(self, population):
+        """Applies the configured mutation to a random mask of rows, in place."""
+        rows = np.flatnonzero(self.np_random.random(len(population)) < self.mutation_prob)
+        if not len(rows):
+            return
+        size = population.shape[1]
+        first = self.np_random.integers(size, size=len(rows))
+        second = (first + self.np_random.integers(1, size, size=len(rows))) % size
+
+        if self.mutation_type == "swap":
+            population[rows, first], population[rows, second] = population[rows, second], population[rows, first]
+            return
+
+        positions = np.arange(size)
+        i, j = first[:, None], second[:, None]
+        if self.mutation_type == "inversion":
+            low, high = np.minimum(i, j), np.maximum(i, j)
+            source = np.where((positions >= low) & (positions <= high), low + high - positions, positions)
+        else:  # insertion: the gene at i moves to position j
+            source = positions + np.where(i < j, (positions >= i) & (positions < j), 0) \
+                - np.where(i > j, (positions > j) & (positions <= i), 0)
+            source = np.where(positions == j, i, source)
+        population[rows] = np.take_along_axis(population[rows], source, axis=1)
+
+    def run(self, runs=1):
+        sample_counter = 0
+        best_costs = []
+        best_route = None
+        best_overall = float("inf")
+        self.budget.start()
+        self.instrumentation.start()
+        self.reset_cache()
+        if self.telemetry is not None:
+            self.telemetry.start(runs, self.generations)
+        self.stopping.start()
+        seeds = self.warm_start.tours()
+
+        for run in range(runs):
+            if best_costs and self.budget.exhausted():
+                break
+            buffers = self.initialize_buffers(seeds)
+            current = 0
+            fitnesses = self.evaluate_buffer(buffers[current])
+            self.budget.charge(self.population_size)
+            best_index = int(fitnesses.argmin())
+            best_individual = buffers[current, best_index].copy()
+            best_cost = float(fitnesses[best_index])
+            self.budget.offer(best_cost, lambda: self.split_into_routes(best_individual.tolist()))
+            self.stopping.start_run(best_cost)
+            if self.telemetry is not None:
+                self.telemetry.record(run, 0, fitnesses, self.count_unique(buffers[current]), best_cost, self.budget)
+
+            for generation in range(1, self.generations + 1):
+                if self.budget.exhausted():
+                    break
+                population, children = buffers[current], buffers[1 - current]
+                parents1, parents2 = self.parent_buffers
+                winners = self.select_parents(fitnesses, 2 * self.population_size)
+                np.take(population, winners[:self.population_size], axis=0, out=parents1)
+                np.take(population, winners[self.population_size:], axis=0, out=parents2)
+                self.crossover_batch(parents1, parents2, children)
+                self.mutate_batch(children)
+                if self.eliminate_clones:
+                    self.replace_clones_batch(children)
+                current = 1 - current
+
+                fitnesses = self.evaluate_buffer(children)
+                self.budget.charge(self.population_size)
+                current_index = int(fitnesses.argmin())
+                current_cost = float(fitnesses[current_index])
+                sample_counter += self.population_size
+
+                if current_cost < best_cost:
+                    best_cost = current_cost
+                    best_individual = children[current_index].copy()
+                    self.budget.offer(best_cost, lambda: self.split_into_routes(best_individual.tolist()))
+                if self.telemetry is not None:
+                    self.telemetry.record(run, generation, fitnesses, self.count_unique(children),
+                                          best_cost, self.budget)
+                diversity = (self.count_unique(children) / self.population_size
+                             if self.stopping.needs_diversity else None)
+                if self.stopping.check(generation, best_cost, diversity):
+                    break
+
+            self.stopping.end_run(self.budget)
+            best_costs.append(best_cost)
+            if best_cost < best_overall:
+                best_overall = best_cost
+                best_route = best_individual.tolist()
+
+        print(f"Total samples evaluated: {sample_counter}")
+        arr = np.array(best_costs)
+        split_routes = self.split_into_routes(best_route)
+        self.warm_start.record(split_routes)
+        return {
+            "best": float(arr.min()),
+            "worst": float(arr.max()),
+            "avg": float(arr.mean()),
+            "std": float(arr.std()),
+
+            "split_routes": split_routes,
+            **self.cache_stats(),
+            **self.budget.report(),
+            **self.stopping.report(self.budget),
+            **self.instrumentation.report(),
+            **(self.telemetry.report() if self.telemetry is not None else {})
+        }
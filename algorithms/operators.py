@@ -0,0 +1,122 @@
+"""
+Permutation crossover and mutation operators for giant-tour GAs.
+
+All operators run in O(n): membership and positions are tracked in arrays
+indexed by customer id (customers are 2..n+1, the depot 1 never appears).
+Crossovers return a new child; mutations modify the individual in place.
+Each takes the caller's random.Random so runs stay reproducible.
+"""
+
+
+def _cut_points(size, rng):
+    return sorted(rng.sample(range(size), 2))
+
+
+def order_crossover(parent1, parent2, rng):
+    """
+    OX: copy parent1[start:end+1] to the same positions, then fill the
+    remaining positions from left to right with parent2's other genes in order.
+    """
+    start, end = _cut_points(len(parent1), rng)
+    segment = parent1[start:end + 1]
+    taken = bytearray(len(parent1) + 2)
+    for gene in segment:
+        taken[gene] = 1
+    rest = [gene for gene in parent2 if not taken[gene]]
+    return rest[:start] + segment + rest[start:]
+
+
+def partially_mapped_crossover(parent1, parent2, rng):
+    """
+    PMX: start from parent2 and, for every position of the segment, swap
+    parent1's gene into place, keeping a position index of the child.
+    """
+    start, end = _cut_points(len(parent1), rng)
+    child = parent2.copy()
+    position = [0] * (len(child) + 2)
+    for i, gene in enumerate(child):
+        position[gene] = i
+
+    for i in range(start, end + 1):
+        j = position[parent1[i]]
+        if i != j:
+            child[i], child[j] = child[j], child[i]
+            position[child[i]] = i
+            position[child[j]] = j
+    return child
+
+
+def edge_recombination_crossover(parent1, parent2, rng):
+    """
+    ERX: build the union of both parents' (cyclic) adjacencies and walk it,
+    always moving to the neighbour with the fewest remaining edges.
+    """
+    size = len(parent1)
+    neighbors = [None] * (size + 2)
+    for parent in (parent1, parent2):
+        for i, gene in enumerate(parent):
+            if neighbors[gene] is None:
+                neighbors[gene] = set()
+            neighbors[gene].add(parent[i - 1])
+            neighbors[gene].add(parent[(i + 1) % size])
+
+    # Unvisited genes with O(1) removal by swapping with the last one
+    unvisited = parent1.copy()
+    slot = [0] * (size + 2)
+    for i, gene in enumerate(unvisited):
+        slot[gene] = i
+
+    child = []
+    current = parent1[0]
+    while True:
+        child.append(current)
+        last = unvisited.pop()
+        if last != current:
+            unvisited[slot[current]] = last
+            slot[last] = slot[current]
+        if not unvisited:
+            return child
+
+        candidates = neighbors[current]
+        for gene in candidates:
+            neighbors[gene].discard(current)
+        if candidates:
+            fewest = min(len(neighbors[gene]) for gene in candidates)
+            current = rng.choice(sorted(gene for gene in candidates if len(neighbors[gene]) == fewest))
+        else:
+            current = unvisited[rng.randrange(len(unvisited))]
+
+
+def swap_mutation(individual, rng):
+    i, j = rng.sample(range(len(individual)), 2)
+    individual[i], individual[j] = individual[j], individual[i]
+
+
+def inversion_mutation(individual, rng):
+    i, j = _cut_points(len(individual), rng)
+    individual[i:j + 1] = individual[i:j + 1][::-1]
+
+
+def insertion_mutation(individual, rng):
+    i, j = rng.sample(range(len(individual)), 2)
+    individual.insert(j, individual.pop(i))
+
+
+CROSSOVERS = {
+    "OX": order_crossover,
+    "PMX": partially_mapped_crossover,
+    "ERX": edge_recombination_crossover,
+}
+
+MUTATIONS = {
+    "swap": swap_mutation,
+    "inversion": inversion_mutation,
+    "insertion": insertion_mutation,
+}
+
+
+def get_operator(registry, name, kind):
+    try:
+        return registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown {kind} type {name!r}, expected one of {sorted(registry)}") from None
@@ -0,0 +1,249 @@
+import math
+import multiprocessing
+import random
+
+from algorithms.budget import Budget
+from algorithms.evaluation import split_tour
+from algorithms.route_solution import RouteSolution
+from algorithms.simulated_annealing import SimulatedAnnealingCVRP
+from algorithms.warm_start import WarmStart
+from algorithms.workers import receive, serve, start_worker, stop_workers
+
+# Default number of chains on machines with fewer cores
+MIN_REPLICAS = 4
+
+
+def temperature_ladder(replicas, min_temp, max_temp):
+    """Geometric ladder of `replicas` temperatures from min_temp (coldest) to max_temp."""
+    if replicas == 1:
+        return [float(min_temp)]
+    ratio = (max_temp / min_temp) ** (1 / (replicas - 1))
+    return [min_temp * ratio ** k for k in range(replicas)]
+
+
+class Replica:
+    """
+    One Metropolis chain of the replica-exchange SA. It runs at whatever
+    temperature it is given for each sweep, using the moves and acceptance
+    rule of its own SimulatedAnnealingCVRP (mode, RNG).
+    """
+    def __init__(self, cvrp_data, sa_params, seed, start_routes=None):
+        self.sa = SimulatedAnnealingCVRP(cvrp_data, seed=seed, **sa_params)
+        self.cvrp = cvrp_data
+        self.customers = list(cvrp_data.locations.keys())[1:]  # exclude depot
+        if start_routes is None:
+            tour = self.customers.copy()
+            self.sa.random.shuffle(tour)
+        else:
+            tour = [c for route in start_routes for c in route]
+
+        if self.sa.mode == "routes":
+            self.solution = RouteSolution(cvrp_data, split_tour(cvrp_data, tour) if start_routes is None
+                                          else start_routes)
+            self.cost = self.solution.cost
+            self.best = self.solution.as_routes()
+        else:
+            self.current = tour
+            self.cost = self.sa.evaluate_route(tour)
+            self.best = tour.copy()
+        self.best_cost = self.cost
+        self.samples = 1
+
+    def sweep(self, temperature, moves):
+        """
+        Runs `moves` proposals at a fixed temperature and reports
+        (current cost, best cost, best solution, evaluations so far); the best
+        solution is a giant tour, or routes in "routes" mode.
+        """
+        if self.sa.mode == "routes":
+            self._sweep_routes(temperature, moves)
+        else:
+            self._sweep_giant_tour(temperature, moves)
+        self.samples += moves
+        return self.cost, self.best_cost, self.best, self.samples
+
+    def _sweep_giant_tour(self, temperature, moves):
+        sa = self.sa
+        for _ in range(moves):
+            neighbor = sa.swap_customers(self.current)
+            cost = sa.evaluate_route(neighbor)
+            if sa.accept(cost - self.cost, temperature):
+                self.current, self.cost = neighbor, cost
+                if cost < self.best_cost:
+                    self.best, self.best_cost = neighbor.copy(), cost
+
+    def _sweep_routes(self, temperature, moves):
+        sa, solution = self.sa, self.solution
+        for _ in range(moves):
+            delta, apply, args = sa.propose_route_move(solution, self.customers)
+            if delta is not None and sa.accept(delta, temperature):
+                apply(*args, delta)
+                if solution.cost < self.best_cost:
+                    self.best, self.best_cost = solution.as_routes(), solution.cost
+        self.cost = solution.cost
+
+
+def _replica_worker(conn, cvrp_data, sa_params, seed, start_routes):
+    """Worker process owning one Replica; serves sweeps until it receives None."""
+    serve(conn,
+          build=lambda: Replica(cvrp_data, sa_params, seed, start_routes),
+          handle=lambda replica, message: replica.sweep(*message),
+          finish=lambda replica: replica.samples)
+
+
+class ParallelTemperingSA:
+    """
+    Replica-exchange (parallel tempering) Simulated Annealing for CVRP:
+    several chains run in parallel worker processes, each at one temperature
+    of a fixed ladder, and every `exchange_interval` moves neighboring
+    temperatures swap their chains with probability
+    min(1, exp((1/T_cold - 1/T_hot) * (E_cold - E_hot))).
+
+    Hot chains roam freely and hand good regions down to the cold chains,
+    which refine them; unlike independent SA restarts, one unlucky start
+    does not decide the result.
+    """
+    def __init__(self, cvrp_data, replicas=None, min_temp=1.0, max_temp=30.0, temperatures=None,
+                 exchanges=200, exchange_interval=100, use_processes=True, seed=None,
+                 time_limit=None, max_evaluations=None, callback=None,
+                 initial_solutions=None, elite_pool=None, **sa_params):
+        """
+        :param cvrp_data: An instance of CVRPData.
+        :param replicas: Number of chains; None uses every core (at least
+                         MIN_REPLICAS, so there is something to exchange).
+        :param min_temp: Temperature of the coldest chain.
+        :param max_temp: Temperature of the hottest chain.
+        :param temperatures: Optional explicit ladder (overrides replicas,
+                             min_temp and max_temp).
+        :param exchanges: Exchange rounds; each replica makes
+                          exchanges * exchange_interval proposals in total.
+        :param exchange_interval: Proposals per replica between two exchanges.
+        :param use_processes: Run each replica in its own process; False
+                              steps them in this process (same results).
+        :param seed: Seed for replica seeds and exchange decisions.
+        :param time_limit: Optional wall-clock limit in seconds, checked at
+                           every exchange.
+        :param max_evaluations: Optional limit on proposals over all replicas.
+        :param callback: Optional callable receiving every new best-so-far.
+        :param initial_solutions: Optional seeds ("greedy", tours or routes),
+                                  given to the replicas in turn.
+        :param elite_pool: Optional ElitePool (or True for the instance's
+                           default pool) read for seeds and updated at the end.
+        :param sa_params: SimulatedAnnealingCVRP kwargs of every replica
+                          (mode; the cooling parameters are not used).
+        """
+        if temperatures is None:
+            temperatures = temperature_ladder(replicas or max(MIN_REPLICAS, multiprocessing.cpu_count()),
+                                              min_temp, max_temp)
+        self.cvrp = cvrp_data
+        self.temperatures = sorted(float(t) for t in temperatures)
+        self.exchanges = exchanges
+        self.exchange_interval = exchange_interval
+        self.use_processes = use_processes
+        self.random = random.Random(seed)
+        self.budget = Budget(time_limit, max_evaluations, callback)
+        self.warm_start = WarmStart(cvrp_data, initial_solutions, elite_pool)
+        # Fail here on bad settings rather than inside a worker process
+        SimulatedAnnealingCVRP(cvrp_data, **sa_params)
+        self.sa_params = sa_params
+        self.mode = sa_params.get("mode", "giant_tour")
+
+    def as_routes(self, solution):
+        return solution if self.mode == "routes" else split_tour(self.cvrp, solution)
+
+    def _start_replicas(self, seeds, starts):
+        if not self.use_processes:
+            return [Replica(self.cvrp, self.sa_params, seed, start) for seed, start in zip(seeds, starts)], None
+        workers = [start_worker(_replica_worker, self.cvrp, self.sa_params, seed, start)
+                   for seed, start in zip(seeds, starts)]
+        return [conn for conn, _ in workers], [process for _, process in workers]
+
+    def exchange(self, ladder, costs, parity):
+        """
+        Attempts swaps between the chains at temperatures (k, k + 1) for every
+        k of the given parity; ladder[k] is the replica at temperature k.
+        :return: Temperature indices k whose swap was accepted.
+        """
+        accepted = []
+        for k in range(parity, len(ladder) - 1, 2):
+            cold, hot = ladder[k], ladder[k + 1]
+            exponent = (1 / self.temperatures[k] - 1 / self.temperatures[k + 1]) * (costs[cold] - costs[hot])
+            if exponent >= 0 or self.random.random() < math.exp(exponent):
+                ladder[k], ladder[k + 1] = hot, cold
+                accepted.append(k)
+        return accepted
+
+    def run(self):
+        """
+        Execute the replica exchange and return the global best.
+        :return: Dict in the format of SimulatedAnnealingCVRP.run ('best_route',
+                 'best_cost' and 'split_routes'), the budget report and
+                 'exchange_rates' (acceptance rate of every pair of
+                 neighboring temperatures, coldest first).
+        """
+        self.budget.start()
+        count = len(self.temperatures)
+        seeds = [self.random.getrandbits(63) for _ in range(count)]
+        initial = self.warm_start.solutions()
+        starts = [initial[i % len(initial)] if initial else None for i in range(count)]
+        handles, processes = self._start_replicas(seeds, starts)
+        try:
+            best_cost, best_solution, exchange_rates = self._exchange_replicas(handles, processes)
+        finally:
+            if processes is not None:
+                stop_workers(processes)
+
+        best_routes = self.as_routes(best_solution)
+        self.warm_start.record(best_routes)
+        if self.mode == "routes":
+            best = RouteSolution(self.cvrp, best_routes)
+            return {"best_route": best.giant_tour(), "best_cost": best.compute_cost(),
+                    "split_routes": best.as_routes(), "exchange_rates": exchange_rates,
+                    **self.budget.report()}
+        return {"best_route": best_solution, "best_cost": best_cost, "split_routes": best_routes,
+                "exchange_rates": exchange_rates, **self.budget.report()}
+
+    def _exchange_replicas(self, handles, processes):
+        count = len(handles)
+        ladder = list(range(count))
+        attempts = [0] * (count - 1)
+        accepted = [0] * (count - 1)
+        best_cost, best_solution = float("inf"), None
+        charged = 0
+
+        for round_index in range(self.exchanges):
+            if round_index and self.budget.exhausted():
+                break
+            moves = self.exchange_interval
+            budget_left = self.budget.remaining_evaluations()
+            if budget_left is not None:
+                moves = max(1, min(moves, math.ceil(budget_left / count)))
+            temperature_of = {replica: self.temperatures[k] for k, replica in enumerate(ladder)}
+            if processes is None:
+                reports = [replica.sweep(temperature_of[i], moves) for i, replica in enumerate(handles)]
+            else:
+                for i, conn in enumerate(handles):
+                    conn.send((temperature_of[i], moves))
+                reports = [receive(conn) for conn in handles]
+
+            samples = sum(report[3] for report in reports)
+            self.budget.charge(samples - charged)
+            charged = samples
+            for _, cost, solution, _ in reports:
+                if cost < best_cost:
+                    best_cost, best_solution = cost, solution
+            self.budget.offer(best_cost, lambda: self.as_routes(best_solution))
+
+            parity = round_index % 2
+            attempts[parity::2] = [n + 1 for n in attempts[parity::2]]
+            for k in self.exchange(ladder, [report[0] for report in reports], parity):
+                accepted[k] += 1
+
+        if processes is not None:
+            for conn in handles:
+                conn.send(None)
+            for conn in handles:
+                receive(conn)
+
+        exchange_rates = [a / n if n else 0.0 for a, n in zip(accepted, attempts)]
+        return best_cost, best_solution, exchange_rates
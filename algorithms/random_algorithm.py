@@ -1,82 +1,91 @@
 import random
 import numpy as np
 
+from algorithms.budget import Budget
+from algorithms.evaluation import EVAL_BLOCK_SIZE, get_decoder
+from algorithms.warm_start import WarmStart
+
 class RandomSearchCVRP:
     """
     Random Search algorithm for CVRP: generates random routes and reports statistics.
     """
-    def __init__(self, cvrp_data, max_fitness_evals=5000):
+    def __init__(self, cvrp_data, max_fitness_evals=5000, decoder="greedy", seed=None,
+                 time_limit=None, max_evaluations=None, callback=None,
+                 initial_solutions=None, elite_pool=None):
         self.cvrp = cvrp_data
+        self.random = random.Random(seed)
         self.max_fitness_evals = max_fitness_evals
+        # "greedy" cuts the giant tour on capacity overflow, "optimal" uses the Bellman split
+        self.decoder = get_decoder(decoder)
+        # Optional wall-clock / evaluation limits (over all runs) and best-so-far callback
+        self.budget = Budget(time_limit, max_evaluations, callback)
+        # Seed solutions are scored first, so a run never ends worse than its best seed
+        self.warm_start = WarmStart(cvrp_data, initial_solutions, elite_pool)
 
     def evaluate_route(self, route):
-        total_distance = 0.0
-        current_capacity = 0
-        prev_location = 1  # Start at depot
-
-        for customer in route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                total_distance += self.cvrp.distance_matrix[prev_location][1]
-                prev_location = 1
-                current_capacity = 0
-
-            total_distance += self.cvrp.distance_matrix[prev_location][customer]
-            prev_location = customer
-            current_capacity += demand
-
-        total_distance += self.cvrp.distance_matrix[prev_location][1]
-        return total_distance
+        return self.decoder.evaluate(self.cvrp, route)
 
     def split_into_routes(self, flat_route):
-        routes = []
-        route = [1]
-        current_capacity = 0
-
-        for customer in flat_route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                route.append(1)
-                routes.append(route)
-                route = [1, customer]
-                current_capacity = demand
-            else:
-                route.append(customer)
-                current_capacity += demand
-
-        route.append(1)
-        routes.append(route)
-        return routes
+        return self.decoder.split(self.cvrp, flat_route)
 
     def run_multiple(self, runs=10):
         best_costs = []
         best_overall_route = None
-
-        customer_ids = list(self.cvrp.locations.keys())[1:]
+        best_overall_cost = float("inf")
+
+        customer_ids = np.array(list(self.cvrp.locations.keys())[1:])
+        # Permutations are drawn in blocks with NumPy, seeded from self.random
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        self.budget.start()
+        seeds = self.warm_start.tours()
+        seed_costs = None
+        if seeds:
+            # Scored once for all runs, so charged once
+            seed_costs = self.decoder.evaluate_batch(self.cvrp, np.array(seeds))
+            self.budget.charge(len(seeds))
 
         for _ in range(runs):
+            if best_costs and self.budget.exhausted():
+                break
             best_cost = float("inf")
             best_route = None
-
-            for _ in range(self.max_fitness_evals):
-                route = customer_ids.copy()
-                random.shuffle(route)
-                dist = self.evaluate_route(route)
-
-                if dist < best_cost:
-                    best_cost = dist
-                    best_route = route.copy()
+            if seeds:
+                index = int(seed_costs.argmin())
+                best_cost = float(seed_costs[index])
+                best_route = list(seeds[index])
+                self.budget.offer(best_cost, lambda: self.split_into_routes(best_route))
+
+            remaining = self.max_fitness_evals
+            while remaining > 0 and not (best_route and self.budget.exhausted()):
+                block_size = min(EVAL_BLOCK_SIZE, remaining)
+                budget_left = self.budget.remaining_evaluations()
+                if budget_left is not None:
+                    block_size = max(1, min(block_size, budget_left))
+                routes = rng.permuted(np.tile(customer_ids, (block_size, 1)), axis=1)
+                dists = self.decoder.evaluate_batch(self.cvrp, routes)
+                self.budget.charge(block_size)
+                remaining -= block_size
+
+                index = int(dists.argmin())
+                if dists[index] < best_cost:
+                    best_cost = float(dists[index])
+                    best_route = routes[index].tolist()
+                    self.budget.offer(best_cost, lambda: self.split_into_routes(best_route))
 
             best_costs.append(best_cost)
-            if best_overall_route is None or best_cost < self.evaluate_route(best_overall_route):
+            if best_cost < best_overall_cost:
+                best_overall_cost = best_cost
                 best_overall_route = best_route
 
         arr = np.array(best_costs)
+        split_routes = self.split_into_routes(best_overall_route)
+        self.warm_start.record(split_routes)
         return {
             "best": float(arr.min()),
             "worst": float(arr.max()),
             "avg": float(arr.mean()),
             "std": float(arr.std()),
 
-            "split_routes": self.split_into_routes(best_overall_route)
+            "split_routes": split_routes,
+            **self.budget.report()
         }
@@ -0,0 +1,258 @@
+from algorithms.evaluation import DEPOT
+
+
+class RouteSolution:
+    """
+    Explicit multi-route CVRP solution with O(1) move evaluation.
+
+    Keeps, for every customer, its route index, its position in that route and
+    the load of the route up to and including it, so the cost change and the
+    capacity feasibility of a swap, relocate, 2-opt, Or-opt or 2-opt* move can
+    be computed without touching the routes. Applying a move re-indexes only
+    the (at most two) routes it changes.
+
+    Routes are stored without the depot. Positions are 0-based; position -1
+    and position len(route) stand for the depot at either end. One empty
+    route is kept available so relocations can open a new vehicle; routes that
+    become empty beyond that are dropped.
+    """
+    def __init__(self, cvrp, routes):
+        """
+        :param cvrp: An instance of CVRPData.
+        :param routes: Iterable of routes (lists of node ids, depot optional).
+        """
+        self.cvrp = cvrp
+        self.capacity = cvrp.capacity
+        self.demands = cvrp.node_demand_list
+        self.dist = cvrp.distances.pair
+
+        num_ids = cvrp.num_nodes + 1
+        self.routes = [[int(c) for c in route if c != DEPOT] for route in routes]
+        self.routes = [route for route in self.routes if route]
+        self.loads = [0] * len(self.routes)
+        self.route_of = [-1] * num_ids
+        self.pos_of = [-1] * num_ids
+        self.prefix_load = [0] * num_ids
+        for r in range(len(self.routes)):
+            self._index_route(r)
+        self.num_empty = 0
+        self._ensure_spare_route()
+        self.cost = self.compute_cost()
+
+    def _index_route(self, r):
+        load = 0
+        for i, customer in enumerate(self.routes[r]):
+            load += self.demands[customer]
+            self.route_of[customer] = r
+            self.pos_of[customer] = i
+            self.prefix_load[customer] = load
+        self.loads[r] = load
+
+    def _ensure_spare_route(self):
+        if self.num_empty == 0:
+            self.routes.append([])
+            self.loads.append(0)
+            self.num_empty = 1
+
+    def _node(self, r, i):
+        """Customer at position i of route r, or the depot outside the route."""
+        route = self.routes[r]
+        return route[i] if 0 <= i < len(route) else DEPOT
+
+    def _reindex(self, r1, r2, empty_before):
+        self._index_route(r1)
+        if r2 != r1:
+            self._index_route(r2)
+        self.num_empty += self._empty_count(r1, r2) - empty_before
+        for r in sorted({r1, r2}, reverse=True):
+            if self.num_empty > 1 and not self.routes[r]:
+                self._remove_route(r)
+        self._ensure_spare_route()
+
+    def _remove_route(self, r):
+        """Drops empty route r by moving the last route into its slot."""
+        last = self.routes.pop()
+        self.loads.pop()
+        if r < len(self.routes):
+            self.routes[r] = last
+            self._index_route(r)
+        self.num_empty -= 1
+
+    def _empty_count(self, r1, r2):
+        return (not self.routes[r1]) + (r2 != r1 and not self.routes[r2])
+
+    def compute_cost(self):
+        """Exact total distance, recomputed from scratch."""
+        dist = self.dist
+        total = 0.0
+        for route in self.routes:
+            if not route:
+                continue
+            prev = DEPOT
+            for customer in route:
+                total += dist(prev, customer)
+                prev = customer
+            total += dist(prev, DEPOT)
+        return total
+
+    def as_routes(self):
+        """Non-empty routes in the [1, ..., 1] format returned by the solvers."""
+        return [[DEPOT] + route + [DEPOT] for route in self.routes if route]
+
+    def giant_tour(self):
+        """All customers in route order, without depot visits."""
+        return [customer for route in self.routes for customer in route]
+
+    # --- swap: exchange the customers at (r1, i) and (r2, j) ---
+
+    def delta_swap(self, r1, i, r2, j):
+        """Cost change of the swap, or None if it is a no-op or infeasible."""
+        if r1 == r2:
+            if i == j:
+                return None
+            if i > j:
+                i, j = j, i
+        u = self.routes[r1][i]
+        v = self.routes[r2][j]
+        dist = self.dist
+
+        if r1 != r2:
+            du = self.demands[u]
+            dv = self.demands[v]
+            if (self.loads[r1] - du + dv > self.capacity
+                    or self.loads[r2] - dv + du > self.capacity):
+                return None
+        elif j == i + 1:
+            a = self._node(r1, i - 1)
+            b = self._node(r1, j + 1)
+            return (dist(a, v) + dist(v, u) + dist(u, b)
+                    - dist(a, u) - dist(u, v) - dist(v, b))
+
+        pu, nu = self._node(r1, i - 1), self._node(r1, i + 1)
+        pv, nv = self._node(r2, j - 1), self._node(r2, j + 1)
+        return (dist(pu, v) + dist(v, nu) + dist(pv, u) + dist(u, nv)
+                - dist(pu, u) - dist(u, nu) - dist(pv, v) - dist(v, nv))
+
+    def apply_swap(self, r1, i, r2, j, delta):
+        empty_before = self._empty_count(r1, r2)
+        routes = self.routes
+        routes[r1][i], routes[r2][j] = routes[r2][j], routes[r1][i]
+        self._reindex(r1, r2, empty_before)
+        self.cost += delta
+
+    # --- relocate: move the customer at (r1, i) before position j of r2 ---
+
+    def delta_relocate(self, r1, i, r2, j):
+        """
+        Cost change of the relocation, or None if it is a no-op or infeasible.
+        j indexes route r2 as it is before the customer is removed
+        (0..len(route), len(route) meaning "append").
+        """
+        u = self.routes[r1][i]
+        if r1 == r2:
+            if j == i or j == i + 1:
+                return None
+        elif self.loads[r2] + self.demands[u] > self.capacity:
+            return None
+
+        dist = self.dist
+        a, b = self._node(r1, i - 1), self._node(r1, i + 1)
+        x, y = self._node(r2, j - 1), self._node(r2, j)
+        return (dist(a, b) - dist(a, u) - dist(u, b)
+                + dist(x, u) + dist(u, y) - dist(x, y))
+
+    def apply_relocate(self, r1, i, r2, j, delta):
+        empty_before = self._empty_count(r1, r2)
+        customer = self.routes[r1].pop(i)
+        if r1 == r2 and j > i:
+            j -= 1
+        self.routes[r2].insert(j, customer)
+        self._reindex(r1, r2, empty_before)
+        self.cost += delta
+
+    # --- 2-opt*: exchange the tails after position i of r1 and j of r2 ---
+
+    def delta_two_opt_star(self, r1, i, r2, j):
+        """
+        Cost change of the tail exchange, or None if it is a no-op or
+        infeasible. i and j range from -1 (cut right after the depot) to
+        len(route) - 1 (cut before the return to the depot).
+        """
+        if r1 == r2:
+            return None
+        route1, route2 = self.routes[r1], self.routes[r2]
+        if (i == -1 and j == -1) or (i == len(route1) - 1 and j == len(route2) - 1):
+            return None
+
+        head1 = self.prefix_load[route1[i]] if i >= 0 else 0
+        head2 = self.prefix_load[route2[j]] if j >= 0 else 0
+        if (head1 + self.loads[r2] - head2 > self.capacity
+                or head2 + self.loads[r1] - head1 > self.capacity):
+            return None
+
+        dist = self.dist
+        a, b = self._node(r1, i), self._node(r1, i + 1)
+        c, e = self._node(r2, j), self._node(r2, j + 1)
+        return dist(a, e) + dist(c, b) - dist(a, b) - dist(c, e)
+
+    def apply_two_opt_star(self, r1, i, r2, j, delta):
+        empty_before = self._empty_count(r1, r2)
+        route1, route2 = self.routes[r1], self.routes[r2]
+        self.routes[r1] = route1[:i + 1] + route2[j + 1:]
+        self.routes[r2] = route2[:j + 1] + route1[i + 1:]
+        self._reindex(r1, r2, empty_before)
+        self.cost += delta
+
+    # --- 2-opt: reverse positions i..j (i < j) of route r ---
+
+    def delta_two_opt(self, r, i, j):
+        """Cost change of the reversal, or None if it is a no-op."""
+        if i >= j:
+            return None
+        dist = self.dist
+        a, b = self._node(r, i - 1), self.routes[r][i]
+        c, e = self.routes[r][j], self._node(r, j + 1)
+        return dist(a, c) + dist(b, e) - dist(a, b) - dist(c, e)
+
+    def apply_two_opt(self, r, i, j, delta):
+        route = self.routes[r]
+        route[i:j + 1] = route[i:j + 1][::-1]
+        self._index_route(r)
+        self.cost += delta
+
+    # --- Or-opt: move the segment of `length` customers at (r1, i) before
+    # position j of r2, optionally reversed ---
+
+    def delta_or_opt(self, r1, i, length, r2, j, reverse=False):
+        """
+        Cost change of the segment move, or None if it is a no-op or
+        infeasible. j indexes route r2 as it is before the segment is removed.
+        """
+        route1 = self.routes[r1]
+        if i + length > len(route1):
+            return None
+        s, t = route1[i], route1[i + length - 1]
+        if r1 == r2:
+            if i <= j <= i + length:
+                return None
+        else:
+            before = self.prefix_load[route1[i - 1]] if i > 0 else 0
+            if self.loads[r2] + self.prefix_load[t] - before > self.capacity:
+                return None
+        first, last = (t, s) if reverse else (s, t)
+
+        dist = self.dist
+        a, b = self._node(r1, i - 1), self._node(r1, i + length)
+        x, y = self._node(r2, j - 1), self._node(r2, j)
+        return (dist(a, b) - dist(a, s) - dist(t, b)
+                + dist(x, first) + dist(last, y) - dist(x, y))
+
+    def apply_or_opt(self, r1, i, length, r2, j, reverse, delta):
+        empty_before = self._empty_count(r1, r2)
+        segment = self.routes[r1][i:i + length]
+        del self.routes[r1][i:i + length]
+        if r1 == r2 and j > i:
+            j -= length
+        self.routes[r2][j:j] = segment[::-1] if reverse else segment
+        self._reindex(r1, r2, empty_before)
+        self.cost += delta
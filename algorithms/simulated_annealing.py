@@ -1,80 +1,204 @@
 import random
 import math
 
+from algorithms.budget import Budget
+from algorithms.evaluation import evaluate_tour, split_tour
+from algorithms.instrumentation import Instrumentation
+from algorithms.route_solution import RouteSolution
+from algorithms.warm_start import WarmStart
+
+# Solution representations for SimulatedAnnealingCVRP(mode=...)
+SA_MODES = ("giant_tour", "routes")
+
 class SimulatedAnnealingCVRP:
     """
     Simulated Annealing algorithm for CVRP: probabilistically accepts worse
     solutions to escape local minima.
     """
-    def __init__(self, cvrp_data, initial_temp=1000.0, cooling_rate=0.995, stopping_temp=1.0):
+    # Phase name -> method timed when instrumentation is enabled
+    INSTRUMENTED_PHASES = {
+        "neighbors": "swap_customers",
+        "evaluation": "evaluate_route",
+        "move_evaluation": "propose_route_move",
+        "acceptance": "accept",
+    }
+
+    def __init__(self, cvrp_data, initial_temp=1000.0, cooling_rate=0.995, stopping_temp=1.0,
+                 mode="giant_tour", seed=None, time_limit=None, max_evaluations=None, callback=None,
+                 instrument=False, initial_solutions=None, elite_pool=None):
         """
         Initialize SA parameters.
         :param cvrp_data: An instance of CVRPData.
         :param initial_temp: Starting temperature.
         :param cooling_rate: Factor (0<rate<1) to reduce temperature.
         :param stopping_temp: Temperature threshold to stop.
+        :param mode: "giant_tour" swaps customers in a permutation and re-evaluates
+                     it; "routes" works on a RouteSolution with O(1) swap,
+                     relocate and 2-opt* deltas.
+        :param seed: Seed for the solver's private random generator.
+        :param time_limit: Optional wall-clock limit in seconds.
+        :param max_evaluations: Optional limit on evaluated proposals.
+        :param callback: Optional callable receiving every new best-so-far
+                         (see algorithms.budget.Budget).
+        :param instrument: True, or an algorithms.instrumentation.Instrumentation,
+                           to time the SA phases (and optionally profile the run).
+        :param initial_solutions: Optional seeds ("greedy", giant tours or
+                                  routes); the run starts from the cheapest.
+        :param elite_pool: Optional algorithms.warm_start.ElitePool (or True for
+                           the instance's default pool) read for seeds and
+                           updated with the best solution.
         """
+        if mode not in SA_MODES:
+            raise ValueError(f"Unknown SA mode {mode!r}, expected one of {SA_MODES}")
         self.cvrp = cvrp_data
+        self.random = random.Random(seed)
         self.temperature = initial_temp
         self.cooling_rate = cooling_rate
         self.stopping_temp = stopping_temp
+        self.mode = mode
+        self.budget = Budget(time_limit, max_evaluations, callback)
+        self.instrumentation = Instrumentation.from_option(instrument)
+        self.instrumentation.wrap(self, self.INSTRUMENTED_PHASES)
+        self.warm_start = WarmStart(cvrp_data, initial_solutions, elite_pool)
 
     def evaluate_route(self, route):
         """
         Calculate total distance of a CVRP route, respecting capacity.
         """
-        total_distance = 0.0
-        current_capacity = 0
-        prev_location = 1  # Start at depot
-
-        for customer in route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                # Return to depot if capacity exceeded
-                total_distance += self.cvrp.distance_matrix[prev_location][1]
-                prev_location = 1
-                current_capacity = 0
-            total_distance += self.cvrp.distance_matrix[prev_location][customer]
-            current_capacity += demand
-            prev_location = customer
-
-        total_distance += self.cvrp.distance_matrix[prev_location][1]  # return to depot
-        return total_distance
+        return evaluate_tour(self.cvrp, route)
 
     def swap_customers(self, route):
         """
         Generate a neighbor by swapping two customers in the route.
         """
-        a, b = random.sample(range(len(route)), 2)
+        a, b = self.random.sample(range(len(route)), 2)
         neighbor = route.copy()
         neighbor[a], neighbor[b] = neighbor[b], neighbor[a]
         return neighbor
 
+    def accept(self, cost_diff, temperature):
+        """
+        Metropolis criterion: always accept improvements, accept a worse
+        solution with probability exp(-cost_diff / temperature).
+        """
+        return cost_diff < 0 or self.random.uniform(0, 1) < math.exp(-cost_diff / temperature)
+
+    def initial_routes(self):
+        """Cheapest seed solution as routes, or None to start from a random shuffle."""
+        seeds = self.warm_start.solutions()
+        if not seeds:
+            return None
+        return min(seeds, key=lambda routes: RouteSolution(self.cvrp, routes).cost)
+
+    def propose_route_move(self, solution, customers):
+        """
+        Draw a random swap, relocate or 2-opt* move on a RouteSolution.
+        :return: (delta, apply, args); delta is None for no-op/infeasible moves.
+        """
+        u = customers[self.random.randrange(len(customers))]
+        r1, i = solution.route_of[u], solution.pos_of[u]
+        move = self.random.randrange(3)
+
+        if move == 0:
+            v = customers[self.random.randrange(len(customers))]
+            args = (r1, i, solution.route_of[v], solution.pos_of[v])
+            return solution.delta_swap(*args), solution.apply_swap, args
+
+        r2 = self.random.randrange(len(solution.routes))
+        if move == 1:
+            args = (r1, i, r2, self.random.randrange(len(solution.routes[r2]) + 1))
+            return solution.delta_relocate(*args), solution.apply_relocate, args
+
+        args = (r1, i, r2, self.random.randrange(-1, len(solution.routes[r2])))
+        return solution.delta_two_opt_star(*args), solution.apply_two_opt_star, args
+
+    def run_routes(self):
+        """
+        Simulated Annealing on an explicit route set. Each proposal costs O(1);
+        only accepted moves touch the routes.
+        :return: Dict with 'best_route' (customers in route order), 'best_cost'
+                 and 'split_routes'.
+        """
+        customers = list(self.cvrp.locations.keys())[1:]  # exclude depot
+        start = self.initial_routes()
+        if start is None:
+            tour = customers.copy()
+            self.random.shuffle(tour)
+            start = split_tour(self.cvrp, tour)
+        solution = RouteSolution(self.cvrp, start)
+        best_routes = solution.as_routes()
+        best_cost = solution.cost
+        temperature = self.temperature
+        self.budget.offer(best_cost, lambda: best_routes)
+
+        while temperature > self.stopping_temp and not self.budget.exhausted():
+            delta, apply, args = self.propose_route_move(solution, customers)
+            self.budget.charge()
+
+            # Accept new solution by Metropolis criterion
+            if delta is not None and self.accept(delta, temperature):
+                apply(*args, delta)
+                if solution.cost < best_cost:
+                    best_routes = solution.as_routes()
+                    best_cost = solution.cost
+                    self.budget.offer(best_cost, lambda: best_routes)
+
+            # Cool down
+            temperature *= self.cooling_rate
+
+        best_solution = RouteSolution(self.cvrp, best_routes)
+        self.warm_start.record(best_routes)
+        return {
+            "best_route": best_solution.giant_tour(),
+            "best_cost": best_solution.compute_cost(),
+            "split_routes": best_solution.as_routes(),
+            **self.budget.report(),
+            **self.instrumentation.report()
+        }
+
     def run(self):
         """
         Execute the Simulated Annealing process and return best route and cost.
-        :return: Dict with 'best_route' and 'best_cost'.
+        :return: Dict with 'best_route', 'best_cost' and 'split_routes' (plus
+                 the budget report).
         """
-        current_solution = list(self.cvrp.locations.keys())[1:]  # exclude depot
-        random.shuffle(current_solution)
+        self.budget.start()
+        self.instrumentation.start()
+        if self.mode == "routes":
+            return self.run_routes()
+
+        start = self.initial_routes()
+        if start is None:
+            current_solution = list(self.cvrp.locations.keys())[1:]  # exclude depot
+            self.random.shuffle(current_solution)
+        else:
+            current_solution = [c for route in start for c in route]
         best_solution = current_solution.copy()
         best_cost = self.evaluate_route(best_solution)
         current_cost = best_cost
+        temperature = self.temperature
+        self.budget.charge()
+        self.budget.offer(best_cost, lambda: split_tour(self.cvrp, best_solution))
 
-        while self.temperature > self.stopping_temp:
+        while temperature > self.stopping_temp and not self.budget.exhausted():
             new_solution = self.swap_customers(current_solution)
             new_cost = self.evaluate_route(new_solution)
+            self.budget.charge()
             cost_diff = new_cost - current_cost
 
             # Accept new solution by Metropolis criterion
-            if cost_diff < 0 or random.uniform(0, 1) < math.exp(-cost_diff / self.temperature):
+            if self.accept(cost_diff, temperature):
                 current_solution = new_solution
                 current_cost = new_cost
                 if new_cost < best_cost:
                     best_solution = new_solution.copy()
                     best_cost = new_cost
+                    self.budget.offer(best_cost, lambda: split_tour(self.cvrp, best_solution))
 
             # Cool down
-            self.temperature *= self.cooling_rate
+            temperature *= self.cooling_rate
 
-        return {"best_route": best_solution, "best_cost": best_cost}
+        split_routes = split_tour(self.cvrp, best_solution)
+        self.warm_start.record(split_routes)
+        return {"best_route": best_solution, "best_cost": best_cost, "split_routes": split_routes,
+                **self.budget.report(), **self.instrumentation.report()}
@@ -0,0 +1,105 @@
+from collections import deque
+
+# Stop reasons of StoppingRules; Budget adds "time_limit" and "max_evaluations",
+# and runs that use all their iterations report "completed".
+STOP_REASONS = ("no_improvement", "low_diversity", "slow_improvement")
+
+
+class StoppingRules:
+    """
+    Early-termination rules for one solver call, checked once per iteration
+    (GA generation, tabu iteration) of every run:
+
+    - no_improvement: the best cost has not improved for `patience` iterations;
+    - low_diversity: distinct individuals / population size fell below
+      `min_diversity` (population-based solvers only);
+    - slow_improvement: the best cost improved by less than the fraction
+      `min_improvement` over the last `window` iterations.
+
+    Every rule is off by default, so an instance without rules only records
+    why and at which iteration each run stopped.
+    """
+    def __init__(self, patience=None, min_diversity=None, min_improvement=None, window=100):
+        """
+        :param patience: Iterations without a new best before stopping.
+        :param min_diversity: Diversity threshold in [0, 1].
+        :param min_improvement: Relative improvement threshold (e.g. 0.001).
+        :param window: Iterations over which min_improvement is measured.
+        """
+        self.patience = patience
+        self.min_diversity = min_diversity
+        self.min_improvement = min_improvement
+        self.window = window
+        self.reasons = []
+        self.iterations = []
+        self.start_run()
+
+    @classmethod
+    def from_option(cls, option):
+        """Accepts a StoppingRules, a dict of its kwargs or None (no rules)."""
+        if isinstance(option, cls):
+            return option
+        return cls(**(option or {}))
+
+    @property
+    def needs_diversity(self):
+        return self.min_diversity is not None
+
+    def start(self):
+        """Forgets the runs of a previous solver call."""
+        self.reasons = []
+        self.iterations = []
+        self.start_run()
+
+    def start_run(self, best_cost=float("inf")):
+        """
+        Resets the per-run state.
+        :param best_cost: Best cost of the run at iteration 0 (its initial
+                          solution), so patience counts from there.
+        """
+        self.reason = None
+        self.iteration = 0
+        self.best_cost = best_cost
+        self.last_improvement = 0
+        self.history = deque(maxlen=self.window + 1)
+
+    def check(self, iteration, best_cost, diversity=None):
+        """
+        Records an iteration of the current run.
+        :param best_cost: Best cost of the run so far.
+        :param diversity: Population diversity in [0, 1], if the solver has one.
+        :return: True (and remembers the reason) if the run should stop.
+        """
+        self.iteration = iteration
+        if best_cost < self.best_cost:
+            self.best_cost = best_cost
+            self.last_improvement = iteration
+        self.history.append(best_cost)
+
+        if self.patience is not None and iteration - self.last_improvement >= self.patience:
+            self.reason = "no_improvement"
+        elif self.needs_diversity and diversity is not None and diversity < self.min_diversity:
+            self.reason = "low_diversity"
+        elif (self.min_improvement is not None and len(self.history) == self.history.maxlen
+              and self.history[0] - self.history[-1] < self.min_improvement * abs(self.history[0])):
+            self.reason = "slow_improvement"
+        return self.reason is not None
+
+    def end_run(self, budget):
+        """Stores why the current run ended: a rule, the budget, or "completed"."""
+        self.reasons.append(self.reason or budget.stop_reason or "completed")
+        self.iterations.append(self.iteration)
+
+    def report(self, budget):
+        """
+        Stop fields added to the solver results. stop_reason is the reason the
+        last run ended, with the same precedence as end_run: a rule that fired
+        overrides Budget's stop_reason.
+        """
+        last_reason = self.reasons[-1] if self.reasons else budget.stop_reason or "completed"
+        return {
+            "stop_reason": last_reason,
+            "stop_iteration": self.iterations[-1] if self.iterations else 0,
+            "run_stop_reasons": list(self.reasons),
+            "run_stop_iterations": list(self.iterations),
+        }
@@ -1,56 +1,64 @@
+import math
 import random
 import numpy as np
 from collections import deque
 import heapq
 
+from algorithms.budget import Budget
+from algorithms.evaluation import get_decoder
+from algorithms.instrumentation import Instrumentation
+from algorithms.route_solution import RouteSolution
+from algorithms.stopping import StoppingRules
+from algorithms.warm_start import WarmStart
+
 class TabuSearchCVRP:
     """
     Tabu Search algorithm for CVRP: improves routes using a tabu list to escape local minima.
+
+    With granular=True the search works on an explicit RouteSolution instead
+    of a giant tour: candidate moves (relocate, swap, 2-opt*) are drawn only
+    between a customer and its nearest neighbors, scored with O(1) cost
+    deltas, and recently moved customers are tabu.
     """
-    def __init__(self, cvrp_data, tabu_tenure=15, max_iterations=5000, neighbor_sample_size=100):
+    # Phase name -> method timed when instrumentation is enabled
+    INSTRUMENTED_PHASES = {
+        "neighbors": "sample_neighbors",
+        "evaluation": "evaluate_neighbors",
+        "move_evaluation": "sample_granular_move",
+    }
+
+    def __init__(self, cvrp_data, tabu_tenure=15, max_iterations=5000, neighbor_sample_size=100,
+                 decoder="greedy", seed=None, granular=False, granularity=10,
+                 time_limit=None, max_evaluations=None, callback=None, instrument=False,
+                 initial_solutions=None, elite_pool=None, stopping=None):
         self.cvrp = cvrp_data
+        self.random = random.Random(seed)
         self.tabu_tenure = tabu_tenure
         self.max_iterations = max_iterations
         self.neighbor_sample_size = neighbor_sample_size
+        # "greedy" cuts the giant tour on capacity overflow, "optimal" uses the Bellman split
+        self.decoder = get_decoder(decoder)
+        self.granular = granular
+        self.granularity = granularity
+        # Optional wall-clock / evaluation limits (over all runs) and best-so-far callback
+        self.budget = Budget(time_limit, max_evaluations, callback)
+        # Per-phase timers (True or an Instrumentation with profiling options)
+        self.instrumentation = Instrumentation.from_option(instrument)
+        self.instrumentation.wrap(self, self.INSTRUMENTED_PHASES)
+        # Seed solutions (run i starts from seed i, cycling) and optional elite pool
+        self.warm_start = WarmStart(cvrp_data, initial_solutions, elite_pool)
+        # Early termination of stagnating runs (a StoppingRules or a dict of its
+        # kwargs); there is no population, so min_diversity does not apply
+        self.stopping = StoppingRules.from_option(stopping)
 
     def evaluate_route(self, route):
-        total_distance = 0.0
-        current_capacity = 0
-        prev_location = 1  # Start at depot
-
-        for customer in route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                total_distance += self.cvrp.distance_matrix[prev_location][1]
-                prev_location = 1
-                current_capacity = 0
-
-            total_distance += self.cvrp.distance_matrix[prev_location][customer]
-            current_capacity += demand
-            prev_location = customer
-
-        total_distance += self.cvrp.distance_matrix[prev_location][1]
-        return total_distance
+        return self.decoder.evaluate(self.cvrp, route)
 
     def split_into_routes(self, flat_route):
-        routes = []
-        route = [1]
-        current_capacity = 0
-
-        for customer in flat_route:
-            demand = self.cvrp.demands[customer]
-            if current_capacity + demand > self.cvrp.capacity:
-                route.append(1)
-                routes.append(route)
-                route = [1, customer]
-                current_capacity = demand
-            else:
-                route.append(customer)
-                current_capacity += demand
-
-        route.append(1)
-        routes.append(route)
-        return routes
+        return self.decoder.split(self.cvrp, flat_route)
+
+    def evaluate_neighbors(self, neighbors):
+        return self.decoder.evaluate_batch(self.cvrp, neighbors)
 
     def generate_neighbors(self, route):
         neighbors = []
@@ -62,36 +70,61 @@ class TabuSearchCVRP:
                 neighbors.append((i, j, neighbor))
         return neighbors
 
-    def run(self, runs=1):
-        best_costs = []
-        best_solution = None
-        customer_ids = list(self.cvrp.locations.keys())[1:]  # exclude depot
-        sample_counter = 0
+    def sample_neighbors(self, route):
+        """
+        Same distribution as sampling generate_neighbors(route), but draws the
+        swap indices directly and only copies the sampled neighbors.
+        """
+        n = len(route)
+        num_pairs = n * (n - 1) // 2
+        sampled = []
+        for k in self.random.sample(range(num_pairs), min(self.neighbor_sample_size, num_pairs)):
+            # k-th pair (i, j), i < j, in the order generate_neighbors lists them
+            i = n - 2 - (math.isqrt(4 * n * (n - 1) - 8 * k - 7) - 1) // 2
+            j = k + i + 1 - num_pairs + (n - i) * (n - i - 1) // 2
+            neighbor = route[:]
+            neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
+            sampled.append((i, j, neighbor))
+        return sampled
 
-        for _ in range(runs):
+    def search_giant_tour(self, customer_ids, start=None):
+        """
+        One tabu run on a giant tour, from `start` (routes) or a random shuffle.
+        :return: (best cost, best routes, samples)
+        """
+        sample_counter = 0
+        if start:
+            current_solution = [c for route in start for c in route]
+        else:
             current_solution = customer_ids.copy()
-            random.shuffle(current_solution)
-            best_solution = current_solution
-            best_cost = self.evaluate_route(best_solution)
-
-            tabu_queue = deque()
-            tabu_set = set()
-
-            for _ in range(self.max_iterations):
-                neighbors = self.generate_neighbors(current_solution)
-                sampled_neighbors = random.sample(
-                    neighbors,
-                    min(self.neighbor_sample_size, len(neighbors))
-                )
-
-                neighbor_evals = [
-                    (i, j, neighbor, self.evaluate_route(neighbor))
-                    for i, j, neighbor in sampled_neighbors
-                ]
-                sample_counter += len(sampled_neighbors)
+            self.random.shuffle(current_solution)
+        best_solution = current_solution
+        best_cost = self.evaluate_route(best_solution)
+        self.budget.charge()
+        self.budget.offer(best_cost, lambda: self.split_into_routes(best_solution))
+        self.stopping.start_run(best_cost)
+
+        tabu_queue = deque()
+        tabu_set = set()
+
+        for iteration in range(1, self.max_iterations + 1):
+            if self.budget.exhausted():
+                break
+            sampled_neighbors = self.sample_neighbors(current_solution)
+
+            costs = self.evaluate_neighbors([neighbor for _, _, neighbor in sampled_neighbors])
+            neighbor_evals = [
+                (i, j, neighbor, float(cost))
+                for (i, j, neighbor), cost in zip(sampled_neighbors, costs)
+            ]
+            sample_counter += len(sampled_neighbors)
+            self.budget.charge(len(sampled_neighbors))
 
+            with self.instrumentation.phase("acceptance"):
                 top_neighbors = heapq.nsmallest(1, neighbor_evals, key=lambda x: x[3])
                 if not top_neighbors:
+                    if self.stopping.check(iteration, best_cost):
+                        break
                     continue
 
                 i, j, neighbor, cost = top_neighbors[0]
@@ -102,20 +135,129 @@ class TabuSearchCVRP:
                     if cost < best_cost:
                         best_solution = neighbor
                         best_cost = cost
+                        self.budget.offer(best_cost, lambda: self.split_into_routes(best_solution))
                     tabu_queue.append(move)
                     tabu_set.add(move)
                     if len(tabu_queue) > self.tabu_tenure:
                         old_move = tabu_queue.popleft()
                         tabu_set.discard(old_move)
+                else:
+                    self.instrumentation.count("tabu_rejections")
+            if self.stopping.check(iteration, best_cost):
+                break
+
+        return best_cost, self.split_into_routes(best_solution), sample_counter
+
+    def sample_granular_move(self, solution, customers, candidates):
+        """
+        Draws one move that creates an edge between a random customer u and one
+        of its nearest neighbors v.
+        :return: (delta, apply, args, moved customers); delta is None if the
+                 move is a no-op or infeasible.
+        """
+        u = customers[self.random.randrange(len(customers))]
+        v = self.random.choice(candidates[u])
+        ru, iu = solution.route_of[u], solution.pos_of[u]
+        rv, iv = solution.route_of[v], solution.pos_of[v]
+        move = self.random.randrange(3)
+
+        if move == 0:  # relocate u right after v
+            args = (ru, iu, rv, iv + 1)
+            return solution.delta_relocate(*args), solution.apply_relocate, args, (u,)
+        if move == 1:  # swap u and v
+            args = (ru, iu, rv, iv)
+            return solution.delta_swap(*args), solution.apply_swap, args, (u, v)
+        # 2-opt*: the tail of u's route is replaced by v and everything after it
+        args = (ru, iu, rv, iv - 1)
+        return solution.delta_two_opt_star(*args), solution.apply_two_opt_star, args, (u, v)
+
+    def search_granular(self, customer_ids, start=None):
+        """
+        One granular tabu run, from `start` (routes) or a split random shuffle.
+        :return: (best cost, best routes, samples)
+        """
+        sample_counter = 0
+        candidates = self.cvrp.nearest_neighbors(self.granularity).tolist()
+        if not start:
+            tour = customer_ids.copy()
+            self.random.shuffle(tour)
+            start = self.split_into_routes(tour)
+        solution = RouteSolution(self.cvrp, start)
+        best_cost = solution.cost
+        best_routes = solution.as_routes()
+        self.budget.offer(best_cost, lambda: best_routes)
+        self.stopping.start_run(best_cost)
+        # Customer-based tabu attribute: iteration until which a customer may not move
+        tabu_until = [0] * (self.cvrp.num_nodes + 1)
+
+        for iteration in range(1, self.max_iterations + 1):
+            if self.budget.exhausted():
+                break
+            best_move = None
+            for _ in range(self.neighbor_sample_size):
+                delta, apply, args, moved = self.sample_granular_move(solution, customer_ids, candidates)
+                if delta is None:
+                    continue
+                sample_counter += 1
+                self.budget.charge()
+                is_tabu = any(tabu_until[c] >= iteration for c in moved)
+                # Aspiration: a tabu move is allowed if it yields a new best
+                if is_tabu and solution.cost + delta >= best_cost:
+                    self.instrumentation.count("tabu_rejections")
+                    continue
+                if best_move is None or delta < best_move[0]:
+                    best_move = (delta, apply, args, moved)
+
+            if best_move is not None:
+                with self.instrumentation.phase("acceptance"):
+                    delta, apply, args, moved = best_move
+                    apply(*args, delta)
+                    for customer in moved:
+                        tabu_until[customer] = iteration + self.tabu_tenure
+                    if solution.cost < best_cost:
+                        best_cost = solution.cost
+                        best_routes = solution.as_routes()
+                        self.budget.offer(best_cost, lambda: best_routes)
+            if self.stopping.check(iteration, best_cost):
+                break
+
+        # Remove drift accumulated by the incremental deltas
+        return RouteSolution(self.cvrp, best_routes).compute_cost(), best_routes, sample_counter
+
+    def run(self, runs=1):
+        best_costs = []
+        best_routes = None
+        best_overall = float("inf")
+        customer_ids = list(self.cvrp.locations.keys())[1:]  # exclude depot
+        sample_counter = 0
+        search = self.search_granular if self.granular else self.search_giant_tour
+        self.budget.start()
+        self.instrumentation.start()
+        self.stopping.start()
+        seeds = self.warm_start.solutions()
 
+        for run in range(runs):
+            if best_costs and self.budget.exhausted():
+                break
+            start = seeds[run % len(seeds)] if seeds else None
+            best_cost, routes, samples = search(customer_ids, start)
+            self.stopping.end_run(self.budget)
+            sample_counter += samples
             best_costs.append(best_cost)
+            if best_cost < best_overall:
+                best_overall = best_cost
+                best_routes = routes
 
         arr = np.array(best_costs)
         print(f"Total samples evaluated: {sample_counter}")
+        self.warm_start.record(best_routes)
         return {
             "best": float(arr.min()),
             "worst": float(arr.max()),
             "avg": float(arr.mean()),
             "std": float(arr.std()),
-            "split_routes": self.split_into_routes(best_solution)
+            "split_routes": best_routes,
+            **self.budget.report(),
+            **self.stopping.report(self.budget),
+            **self.instrumentation.report()
         }
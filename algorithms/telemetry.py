@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+
+# Per-generation fields recorded by GenerationTelemetry
+TELEMETRY_FIELDS = ("min", "max", "mean", "std", "unique", "best_so_far", "evaluations", "elapsed")
+
+
+class GenerationTelemetry:
+    """
+    Per-generation statistics of a GA population: fitness min/max/mean/std,
+    number of distinct individuals, best-so-far cost, evaluations and elapsed
+    time. Rows are written into arrays preallocated at start() and can also be
+    streamed to a callback and/or an NDJSON file (one JSON object per line).
+
+    Generation 0 is the initial population, so a run of G generations fills
+    G + 1 rows; rows of generations cut short by a budget stay NaN.
+    """
+    def __init__(self, record=True, callback=None, ndjson_path=None):
+        """
+        :param record: Keep the statistics in NumPy arrays (returned by report()).
+        :param callback: Optional callable receiving every row as a dict.
+        :param ndjson_path: Optional file the rows are streamed to; it is
+                            truncated at every start().
+        """
+        self.record_arrays = record
+        self.callback = callback
+        self.ndjson_path = ndjson_path
+        self.arrays = None
+        self.stream = None
+
+    @classmethod
+    def from_option(cls, option):
+        """Accepts a GenerationTelemetry, True (arrays only) or a false value (None)."""
+        if isinstance(option, cls):
+            return option
+        return cls() if option else None
+
+    def start(self, runs, generations):
+        if self.record_arrays:
+            shape = (runs, generations + 1)
+            self.arrays = {field: np.full(shape, np.nan) for field in TELEMETRY_FIELDS}
+        if self.ndjson_path is not None:
+            self.stream = open(self.ndjson_path, "w", encoding="utf-8")
+
+    def record(self, run, generation, fitnesses, unique, best_so_far, budget):
+        """
+        :param fitnesses: float array with the costs of the population.
+        :param unique: Number of distinct individuals in the population.
+        :param budget: The solver's Budget (evaluations and elapsed time).
+        """
+        row = {
+            "min": float(fitnesses.min()),
+            "max": float(fitnesses.max()),
+            "mean": float(fitnesses.mean()),
+            "std": float(fitnesses.std()),
+            "unique": unique,
+            "best_so_far": best_so_far,
+            "evaluations": budget.evaluations,
+            "elapsed": budget.elapsed,
+        }
+        if self.arrays is not None:
+            for field, value in row.items():
+                self.arrays[field][run, generation] = value
+        if self.stream is not None or self.callback is not None:
+            row = {"run": run, "generation": generation, **row}
+            if self.stream is not None:
+                self.stream.write(json.dumps(row) + "\n")
+            if self.callback is not None:
+                self.callback(row)
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def report(self):
+        """Closes the stream; the arrays (if recorded) go to the solver results under "telemetry"."""
+        self.stop()
+        return {"telemetry": self.arrays} if self.arrays is not None else {}
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+
+from algorithms.evaluation import DEPOT, split_tour
+from algorithms.route_solution import RouteSolution
+
+# Default folder of the per-instance elite pools
+ELITE_POOL_DIR = os.path.join("data", ".elite")
+
+
+def normalize_solution(cvrp, solution):
+    """
+    Turns a seed solution into routes without the depot.
+    :param solution: "greedy" (GreedyCVRP's routes), a giant tour (customer
+                     ids) or a list of routes (depot optional).
+    :return: List of non-empty routes covering every customer exactly once.
+    """
+    if isinstance(solution, str):
+        if solution != "greedy":
+            raise ValueError(f"Unknown seed solution {solution!r}, expected 'greedy', a tour or routes")
+        # Imported here: the module runs Greedy on the default instance when imported
+        from algorithms.greedy_algorithm import GreedyCVRP
+        solution = GreedyCVRP(cvrp).run()[0]
+    solution = list(solution)
+    if solution and not isinstance(solution[0], (list, tuple)):
+        solution = split_tour(cvrp, [c for c in solution if c != DEPOT])
+    routes = [[int(c) for c in route if c != DEPOT] for route in solution]
+    routes = [route for route in routes if route]
+
+    customers = sorted(c for route in routes for c in route)
+    if customers != list(range(2, cvrp.num_nodes + 1)):
+        raise ValueError("A seed solution must visit every customer exactly once")
+    return routes
+
+
+def solution_key(routes):
+    """Order-insensitive identity of a route set."""
+    return tuple(sorted(tuple(route) for route in routes))
+
+
+class ElitePool:
+    """
+    The best distinct solutions found so far on one instance, kept in a JSON
+    file. Solvers read it to warm-start and merge their best solution back.
+    Writes re-read the file first and replace it atomically, so concurrent
+    runs on the same instance only ever lose each other's entries, never
+    corrupt the file.
+    """
+    def __init__(self, path, size=20):
+        """
+        :param path: JSON file of the pool (created on first save).
+        :param size: Solutions kept, best first.
+        """
+        self.path = path
+        self.size = size
+
+    @classmethod
+    def for_instance(cls, cvrp, pool_dir=ELITE_POOL_DIR, size=20):
+        """Pool of an instance, keyed by the fingerprint of its data."""
+        return cls(os.path.join(pool_dir, f"{cvrp.fingerprint}.json"), size)
+
+    def load(self):
+        """:return: List of {"cost": float, "routes": [[...], ...]}, best first."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)["solutions"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return []
+
+    def solutions(self, count=None):
+        return [entry["routes"] for entry in self.load()[:count]]
+
+    def add(self, cvrp, routes_list):
+        """Merges solutions (lists of routes) into the pool file."""
+        merged = {solution_key(entry["routes"]): entry for entry in self.load()}
+        for routes in routes_list:
+            routes = normalize_solution(cvrp, routes)
+            merged.setdefault(solution_key(routes),
+                              {"cost": RouteSolution(cvrp, routes).compute_cost(), "routes": routes})
+        best = sorted(merged.values(), key=lambda entry: entry["cost"])[:self.size]
+
+        folder = os.path.dirname(self.path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"solutions": best}, file)
+        os.replace(tmp_path, self.path)
+
+
+class WarmStart:
+    """
+    Seed solutions of a solver: explicit initial solutions followed by the
+    elites of an optional pool, which receives the solver's best at the end.
+    """
+    def __init__(self, cvrp, initial_solutions=None, elite_pool=None):
+        """
+        :param initial_solutions: Iterable of seeds accepted by normalize_solution.
+        :param elite_pool: None, True (the instance's pool in ELITE_POOL_DIR)
+                           or an ElitePool.
+        """
+        self.cvrp = cvrp
+        self.initial = [normalize_solution(cvrp, s) for s in initial_solutions or ()]
+        self.pool = ElitePool.for_instance(cvrp) if elite_pool is True else elite_pool or None
+
+    def solutions(self):
+        """Seeds as lists of routes; the pool is read at every call."""
+        seeds = list(self.initial)
+        if self.pool is not None:
+            seeds += [normalize_solution(self.cvrp, routes) for routes in self.pool.solutions()]
+        return seeds
+
+    def tours(self):
+        """Seeds as giant tours (routes concatenated)."""
+        return [[c for route in routes for c in route] for routes in self.solutions()]
+
+    def record(self, routes):
+        """Merges a final solution (routes, depot optional) into the pool, if any."""
+        if self.pool is not None and routes:
+            self.pool.add(self.cvrp, [routes])
@@ -0,0 +1,61 @@
+import multiprocessing
+import traceback
+
+
+class WorkerError(RuntimeError):
+    """An exception raised in a worker process; the message holds its traceback."""
+
+
+def start_worker(target, *args):
+    """
+    Starts a daemon process running target(conn, *args).
+    :return: (parent end of the pipe, process)
+    """
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=target, args=(child_conn, *args), daemon=True)
+    process.start()
+    # Only the worker keeps its end open, so a dead worker shows up as EOFError
+    child_conn.close()
+    return parent_conn, process
+
+
+def serve(conn, build, handle, finish):
+    """
+    Worker loop: state = build(), then replies handle(state, message) to every
+    message and finish(state) to the final None. Replies are ("ok", value);
+    an exception is sent back as ("error", traceback) and ends the worker.
+    """
+    try:
+        state = build()
+        while True:
+            message = conn.recv()
+            if message is None:
+                conn.send(("ok", finish(state)))
+                return
+            conn.send(("ok", handle(state, message)))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def receive(conn):
+    """
+    Next reply of a worker started with start_worker and running serve().
+    :raises WorkerError: If the worker failed or exited without replying.
+    """
+    try:
+        status, value = conn.recv()
+    except EOFError:
+        raise WorkerError("Worker process exited without replying") from None
+    if status == "error":
+        raise WorkerError(f"Worker process failed:\n{value}")
+    return value
+
+
+def stop_workers(processes):
+    """Terminates workers still running (e.g. after another one failed)."""
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
+from algorithms.numpy_genetic_algorithm import NumpyGeneticAlgorithmCVRP
+from algorithms.random_algorithm import RandomSearchCVRP
+from algorithms.simulated_annealing import SimulatedAnnealingCVRP
+from algorithms.tabu_algorithm import TabuSearchCVRP
+from cvrp_solver import load_cvrp
+
+DATA_FOLDER = "data"
+OPTIMAL_FOLDER = "data/optimal_data"
+DEFAULT_BASELINE = "results/benchmark_baseline.json"
+SEED = 0
+
+# name -> (solver class, method, constructor kwargs). Every benchmark runs a
+# fixed number of evaluations with a fixed seed, so its cost is reproducible
+# and only its timing depends on the machine and the code.
+BENCHMARKS = {
+    "random": (RandomSearchCVRP, "run_multiple",
+               {"max_fitness_evals": 2000}),  # run_multiple() does 10 runs
+    "tabu": (TabuSearchCVRP, "run",
+             {"max_iterations": 10 ** 6, "neighbor_sample_size": 50, "max_evaluations": 20000}),
+    "tabu_granular": (TabuSearchCVRP, "run",
+                      {"granular": True, "max_iterations": 10 ** 6, "neighbor_sample_size": 50,
+                       "max_evaluations": 50000}),
+    "ga": (GeneticAlgorithmCVRP, "run",
+           {"population_size": 50, "generations": 10 ** 6, "max_evaluations": 20000}),
+    "ga_numpy": (NumpyGeneticAlgorithmCVRP, "run",
+                 {"population_size": 50, "generations": 10 ** 6, "max_evaluations": 20000}),
+    "sa": (SimulatedAnnealingCVRP, "run",
+           {"cooling_rate": 0.9995, "stopping_temp": 1e-3, "max_evaluations": 20000}),
+    "sa_routes": (SimulatedAnnealingCVRP, "run",
+                  {"mode": "routes", "cooling_rate": 0.9999, "stopping_temp": 1e-3,
+                   "max_evaluations": 50000}),
+}
+
+
+def read_optimal_cost(file_path):
+    try:
+        with open(file_path, 'r') as file:
+            for line in file:
+                if "Cost" in line:
+                    return float(line.split()[-1])
+    except FileNotFoundError:
+        return None
+    return None
+
+
+def run_solver(cvrp_data, name, trace_memory=False):
+    """
+    One seeded run of a benchmark.
+    :return: (result dict of the solver, wall time in seconds, peak traced bytes or None)
+    """
+    solver_class, method, params = BENCHMARKS[name]
+    solver = solver_class(cvrp_data, seed=SEED, **params)
+    if trace_memory:
+        tracemalloc.start()
+    # The solvers print progress counters; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = getattr(solver, method)()
+        wall_time = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, wall_time, peak
+
+
+def benchmark_instance(file_path, names, repeats=3):
+    """
+    Measures every benchmark on one instance. Wall time is the best of
+    `repeats` untraced runs; peak memory comes from one extra run under
+    tracemalloc, which is too slow to time.
+    """
+    cvrp_data = load_cvrp(file_path)
+    optimal_cost = read_optimal_cost(os.path.join(OPTIMAL_FOLDER, os.path.basename(file_path)))
+    measurements = {}
+    for name in names:
+        timings = []
+        for _ in range(repeats):
+            result, wall_time, _ = run_solver(cvrp_data, name)
+            timings.append(wall_time)
+        _, _, peak = run_solver(cvrp_data, name, trace_memory=True)
+
+        cost = result["best"] if "best" in result else result["best_cost"]
+        wall_time = min(timings)
+        measurements[name] = {
+            "cost": float(cost),
+            "gap": (cost - optimal_cost) / optimal_cost if optimal_cost else None,
+            "evaluations": result["evaluations"],
+            "wall_time": wall_time,
+            "evals_per_sec": result["evaluations"] / wall_time,
+            "peak_memory_bytes": peak,
+        }
+    return measurements
+
+
+def run_benchmarks(instance_paths, names, repeats=3):
+    """:return: JSON-serializable report {"environment": ..., "results": {instance: {benchmark: metrics}}}"""
+    results = {}
+    for idx, file_path in enumerate(instance_paths, 1):
+        instance = os.path.basename(file_path)
+        print(f"\n🔄 Benchmarking {idx}/{len(instance_paths)}: {instance}")
+        results[instance] = benchmark_instance(file_path, names, repeats)
+        for name, metrics in results[instance].items():
+            gap = "N/A" if metrics["gap"] is None else f"{100 * metrics['gap']:.2f}%"
+            print(f"  {name:<14} cost={metrics['cost']:.2f} gap={gap} "
+                  f"evals/s={metrics['evals_per_sec']:.0f} time={metrics['wall_time']:.3f}s "
+                  f"peak={metrics['peak_memory_bytes'] / 1024:.0f}KiB")
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, throughput_tolerance=0.1, quality_tolerance=0.01):
+    """
+    Flags benchmarks whose throughput dropped by more than throughput_tolerance
+    (relative) or whose cost rose by more than quality_tolerance (relative)
+    compared to the baseline report.
+    :return: List of regression messages; empty if there are none.
+    """
+    regressions = []
+    for instance, measurements in report["results"].items():
+        for name, metrics in measurements.items():
+            reference = baseline["results"].get(instance, {}).get(name)
+            if reference is None:
+                continue
+            speed = metrics["evals_per_sec"] / reference["evals_per_sec"]
+            if speed < 1 - throughput_tolerance:
+                regressions.append(f"{instance} {name}: throughput {metrics['evals_per_sec']:.0f} evals/s "
+                                   f"vs {reference['evals_per_sec']:.0f} ({100 * (speed - 1):+.1f}%)")
+            if metrics["cost"] > reference["cost"] * (1 + quality_tolerance):
+                regressions.append(f"{instance} {name}: cost {metrics['cost']:.2f} "
+                                   f"vs {reference['cost']:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeded, fixed-budget benchmarks of the CVRP solvers.")
+    parser.add_argument("--instances", nargs="*", help="Instance file names in data/ (default: all)")
+    parser.add_argument("--solvers", nargs="*", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per benchmark; the fastest counts")
+    parser.add_argument("--save", metavar="PATH", nargs="?", const=DEFAULT_BASELINE,
+                        help=f"Write the report as the new baseline (default path: {DEFAULT_BASELINE})")
+    parser.add_argument("--compare", metavar="PATH", nargs="?", const=DEFAULT_BASELINE,
+                        help="Compare against a baseline and exit with status 1 on regressions")
+    parser.add_argument("--throughput-tolerance", type=float, default=0.1)
+    parser.add_argument("--quality-tolerance", type=float, default=0.01)
+    args = parser.parse_args()
+
+    files = args.instances or sorted(f for f in os.listdir(DATA_FOLDER) if f.endswith(".vrp"))
+    names = args.solvers or list(BENCHMARKS)
+    report = run_benchmarks([os.path.join(DATA_FOLDER, f) for f in files], names, args.repeats)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.throughput_tolerance, args.quality_tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,241 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+
 import numpy as np
 
+from distances import (
+    DISTANCE_BLOCK_ROWS, DenseDistances, OnTheFlyDistances,
+    check_distance_options, dense_distance_matrix, explicit_distance_matrix, resolve_distance_mode,
+)
+from tsplib import read_tsplib
+
+# Arrays stored per cached instance; reopened memory-mapped (read-only).
+# distance_matrix is only stored for instances using dense distances.
+CACHE_ARRAYS = ("coords", "demand", "distance_matrix", "node_ids")
+
+# Layout version of the binary cache, part of its key and of meta.json.
+# Bump it whenever the parser or the stored arrays change meaning (version 2:
+# depot moved to row 0 and node_ids added by the TSPLIB reader).
+CACHE_FORMAT_VERSION = 2
+
+
+class NodeArrayView(Mapping):
+    """
+    Read-only {node_id: value} view over a 0-based per-node NumPy array.
+    Node ids are 1-based, so node_id maps to row node_id - 1.
+    """
+    def __init__(self, array, convert):
+        self._array = array
+        self._convert = convert
+
+    def __getitem__(self, node_id):
+        if not 1 <= node_id <= len(self._array):
+            raise KeyError(node_id)
+        return self._convert(self._array[node_id - 1])
+
+    def __iter__(self):
+        return iter(range(1, len(self._array) + 1))
+
+    def __len__(self):
+        return len(self._array)
+
+
 class CVRPData:
     """
     Represents a Capacitated Vehicle Routing Problem (CVRP) instance.
     Reads node coordinates, demands, and vehicle capacity from a file,
-    and computes the distance matrix.
+    and sets up its distances.
+
+    Coordinates and demands are stored as contiguous 0-based arrays
+    (``coords[i]`` and ``demand[i]`` belong to node ``i + 1``), while
+    distances use 1-based node ids as indices. Solvers read distances through
+    ``distances`` (see distances.py): a dense matrix, also exposed as
+    ``distance_matrix`` (row/column 0 unused), or an on-the-fly provider
+    for instances whose matrix would not fit in memory (``distance_matrix``
+    is then None). ``locations`` and ``demands`` are dict-like views over
+    the arrays.
+
+    The depot is always node 1: a depot declared elsewhere in the file is
+    moved there, and ``node_ids[i]`` keeps the file's id of node ``i + 1``.
+    Instances with EXPLICIT edge weights always use a dense matrix, and their
+    coordinates are NaN unless the file has a DISPLAY_DATA_SECTION.
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, distance_dtype="float64", distance_mode="auto"):
         """
         Initialize CVRP data by reading from a file and computing distances.
         :param file_path: Path to the CVRP instance file.
+        :param distance_dtype: One of DISTANCE_DTYPES.
+        :param distance_mode: One of DISTANCE_MODES; "auto" keeps a dense
+                              matrix unless it exceeds DENSE_LIMIT_BYTES.
         """
-        self.locations = {}       # {node_id: (x, y)} for all nodes (including depot)
-        self.demands = {}         # {node_id: demand} for each customer
+        check_distance_options(distance_dtype, distance_mode)
+        self.coords = None        # (n, 2) float64 coordinates, row i is node i + 1
+        self.demand = None        # (n,) int64 demands, row i is node i + 1
         self.capacity = 0         # Vehicle capacity
-        self.depot = None         # Coordinates of the depot (node 1)
+        self.node_ids = None      # (n,) node ids in the file, row i is node i + 1
+        self.edge_weight_type = "EUC_2D"
         self.distance_matrix = None
+        self.distances = None
 
         self.load_data(file_path)
-        self.compute_distance_matrix()
+        self.build_distances(distance_dtype, distance_mode)
+
+    @classmethod
+    def from_arrays(cls, coords, demand, capacity, distance_matrix=None, distance_dtype="float64",
+                    distance_mode="auto", node_ids=None, edge_weight_type="EUC_2D"):
+        """
+        Build an instance from already parsed arrays (e.g. a memory-mapped cache).
+        :param coords: (n, 2) coordinates, row i is node i + 1.
+        :param demand: (n,) demands, row i is node i + 1.
+        :param capacity: Vehicle capacity.
+        :param distance_matrix: Optional precomputed (n + 1, n + 1) matrix, used
+                                unless distance_mode is "on_the_fly";
+                                otherwise distances follow distance_dtype and
+                                distance_mode.
+        :param node_ids: Optional (n,) node ids in the file (default 1..n).
+        :param edge_weight_type: "EXPLICIT" when distance_matrix holds given
+                                 weights rather than coordinate distances.
+        """
+        check_distance_options(distance_dtype, distance_mode)
+        if edge_weight_type == "EXPLICIT" and distance_matrix is None:
+            raise ValueError("An EXPLICIT instance needs its distance_matrix")
+        data = cls.__new__(cls)
+        data.coords = coords
+        data.demand = demand
+        data.capacity = int(capacity)
+        data.node_ids = np.arange(1, len(coords) + 1) if node_ids is None else node_ids
+        data.edge_weight_type = edge_weight_type
+        if distance_matrix is not None and (distance_mode != "on_the_fly" or edge_weight_type == "EXPLICIT"):
+            data.distance_matrix = distance_matrix
+            data.distances = DenseDistances(distance_matrix)
+        else:
+            data.build_distances(distance_dtype, distance_mode)
+        return data
+
+    @property
+    def num_nodes(self):
+        """Number of nodes including the depot."""
+        return len(self.coords)
+
+    @cached_property
+    def node_demand(self):
+        """Demands indexed by node id (entry 0 unused), for fancy indexing with routes."""
+        return np.concatenate(([0], self.demand)).astype(np.int64)
+
+    @cached_property
+    def node_demand_list(self):
+        """node_demand as a plain list, for scalar Python loops."""
+        return self.node_demand.tolist()
+
+    @cached_property
+    def fingerprint(self):
+        """Short SHA-256 of coordinates, demands and capacity, identifying the instance."""
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(self.coords, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(self.demand, dtype=np.int64).tobytes())
+        digest.update(str(self.capacity).encode())
+        if self.edge_weight_type == "EXPLICIT":
+            digest.update(np.ascontiguousarray(self.distance_matrix, dtype=np.float64).tobytes())
+        return digest.hexdigest()[:16]
+
+    @cached_property
+    def _neighbor_lists(self):
+        return {}
+
+    def nearest_neighbors(self, k):
+        """
+        Sorted k-nearest customer lists, cached per k. Equidistant customers
+        are ordered by node id.
+        :param k: Neighbors per node (capped at the number of other customers).
+        :return: (n + 1, k) int array; row i lists the customers closest to node
+                 i (depot included as a row, never as a neighbor), nearest first.
+                 Row 0 is unused.
+        """
+        k = max(0, min(k, self.num_nodes - 2))
+        for cached_k, lists in self._neighbor_lists.items():
+            if cached_k >= k:
+                return lists[:, :k]
+
+        customers = np.arange(2, self.num_nodes + 1)
+        lists = np.zeros((self.num_nodes + 1, k), dtype=np.int32)
+        if k:
+            for start in range(1, self.num_nodes + 1, DISTANCE_BLOCK_ROWS):
+                nodes = np.arange(start, min(start + DISTANCE_BLOCK_ROWS, self.num_nodes + 1))
+                dist = self.distances[nodes[:, None], customers].astype(np.float64)
+                dist[nodes[:, None] == customers] = np.inf  # a node is not its own neighbor
+                # Keep every customer tied with the k-th nearest, then order by
+                # (distance, node id) so ties resolve like a full scan would
+                kth = np.partition(dist, k - 1, axis=1)[:, k - 1:k]
+                width = int((dist <= kth).sum(axis=1).max())
+                nearest = np.argpartition(dist, width - 1, axis=1)[:, :width]
+                order = np.lexsort((nearest, np.take_along_axis(dist, nearest, axis=1)), axis=1)[:, :k]
+                lists[nodes] = customers[np.take_along_axis(nearest, order, axis=1)]
+        self._neighbor_lists[k] = lists
+        return lists
+
+    @property
+    def locations(self):
+        """{node_id: (x, y)} for all nodes (including depot)."""
+        return NodeArrayView(self.coords, lambda xy: tuple(xy.tolist()))
+
+    @property
+    def demands(self):
+        """{node_id: demand} for each node."""
+        return NodeArrayView(self.demand, int)
+
+    @property
+    def depot(self):
+        """Coordinates of the depot (node 1, file id node_ids[0])."""
+        return tuple(self.coords[0].tolist())
 
     def load_data(self, file_path):
         """
-        Reads the CVRP instance from a file (TSPLIB format).
-        Expects sections: CAPACITY, NODE_COORD_SECTION, DEMAND_SECTION.
+        Reads the CVRP instance from a file (TSPLIB format, see tsplib.read_tsplib).
+        """
+        instance = read_tsplib(file_path)
+        self.coords = instance.coords
+        self.demand = instance.demand
+        self.capacity = instance.capacity
+        self.node_ids = instance.node_ids
+        self.edge_weight_type = instance.edge_weight_type
+        if instance.edge_weights is not None:
+            self.distance_matrix = explicit_distance_matrix(instance.edge_weights)
+
+    def file_routes(self, routes):
+        """Routes with node ids as written in the instance file."""
+        return [[int(self.node_ids[node - 1]) for node in route] for route in routes]
+
+    def compute_distance_matrix(self, dtype="float64"):
         """
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-
-        reading_nodes = False
-        reading_demands = False
-
-        for line in lines:
-            parts = line.strip().split()
-            if not parts:
-                continue
-            if "CAPACITY" in line:
-                self.capacity = int(parts[-1])
-            elif "NODE_COORD_SECTION" in line:
-                reading_nodes = True
-                reading_demands = False
-            elif "DEMAND_SECTION" in line:
-                reading_nodes = False
-                reading_demands = True
-            elif "DEPOT_SECTION" in line:
-                reading_nodes = False
-                reading_demands = False
-            elif reading_nodes:
-                node_id, x, y = map(int, parts)
-                self.locations[node_id] = (x, y)
-                if node_id == 1:
-                    self.depot = (x, y)
-            elif reading_demands:
-                node_id, demand = map(int, parts)
-                self.demands[node_id] = demand
-
-    def compute_distance_matrix(self):
+        Computes the Euclidean distance matrix for all nodes with broadcasting.
+        :param dtype: One of DISTANCE_DTYPES; "int32" rounds to the nearest
+                      integer as in TSPLIB.
+        """
+        check_distance_options(dtype)
+        self.distance_matrix = dense_distance_matrix(self.coords, dtype)
+        self.distances = DenseDistances(self.distance_matrix)
+
+    def build_distances(self, distance_dtype="float64", distance_mode="auto"):
         """
-        Computes the Euclidean distance matrix for all nodes.
+        Sets up the distance provider: a dense matrix, or distances computed
+        from the coordinates on demand. EXPLICIT weights are only cast to
+        distance_dtype.
         """
-        num_locations = len(self.locations)
-        # +1 because nodes are 1-based (we skip index 0)
-        self.distance_matrix = np.zeros((num_locations + 1, num_locations + 1))
-        for i in self.locations:
-            x1, y1 = self.locations[i]
-            for j in self.locations:
-                if i == j:
-                    continue
-                x2, y2 = self.locations[j]
-                # Euclidean distance
-                self.distance_matrix[i, j] = np.hypot(x1 - x2, y1 - y2)
+        if self.edge_weight_type == "EXPLICIT":
+            check_distance_options(distance_dtype, distance_mode)
+            self.distance_matrix = explicit_distance_matrix(self.distance_matrix[1:, 1:], distance_dtype)
+            self.distances = DenseDistances(self.distance_matrix)
+        elif resolve_distance_mode(distance_mode, self.num_nodes, distance_dtype) == "dense":
+            self.compute_distance_matrix(distance_dtype)
+        else:
+            self.distance_matrix = None
+            self.distances = OnTheFlyDistances(self.coords, distance_dtype)
 
     def print_data(self):
         """Prints the loaded CVRP data."""
@@ -79,6 +245,149 @@ class CVRPData:
       #  print("📦 Customer Demands:", self.demands)
 
 
+def instance_cache_path(file_path, distance_dtype="float64", cache_dir=None):
+    """
+    Location of the binary cache for an instance file, keyed by the SHA-256 of
+    its content, the distance dtype and CACHE_FORMAT_VERSION. Defaults to a
+    ".cache" folder next to the instance.
+    """
+    with open(file_path, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(file_path) or ".", ".cache")
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}-{distance_dtype}-v{CACHE_FORMAT_VERSION}")
+
+
+def save_instance_cache(cvrp_data, cache_path):
+    """
+    Writes the instance arrays as .npy files plus a small meta.json.
+    The folder is written under a temporary name and renamed into place, so
+    concurrent writers never expose a partial cache.
+    """
+    parent = os.path.dirname(cache_path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        for name in CACHE_ARRAYS:
+            array = getattr(cvrp_data, name)
+            if array is not None:
+                np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+        with open(os.path.join(tmp_path, "meta.json"), "w") as file:
+            json.dump({"format_version": CACHE_FORMAT_VERSION,
+                       "capacity": cvrp_data.capacity,
+                       "distance_dtype": str(cvrp_data.distances.dtype),
+                       "edge_weight_type": cvrp_data.edge_weight_type}, file)
+        os.rename(tmp_path, cache_path)
+    except OSError:
+        # Another process won the race (or the folder is read-only): keep theirs.
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def open_instance_cache(cache_path, distance_mode="auto"):
+    """
+    Reopens a cached instance with memory-mapped, read-only arrays.
+    A cached distance matrix is used unless distance_mode is "on_the_fly";
+    a cache without one (saved on the fly) gets distances per distance_mode.
+    :return: CVRPData, or None if no complete cache of the current
+             CACHE_FORMAT_VERSION exists.
+    """
+    meta_path = os.path.join(cache_path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r') as file:
+        meta = json.load(file)
+    if meta.get("format_version") != CACHE_FORMAT_VERSION:
+        return None
+    arrays = {}
+    for name in CACHE_ARRAYS:
+        array_path = os.path.join(cache_path, f"{name}.npy")
+        if os.path.exists(array_path):
+            arrays[name] = np.load(array_path, mmap_mode="r")
+    return CVRPData.from_arrays(capacity=meta["capacity"], distance_mode=distance_mode,
+                                distance_dtype=meta.get("distance_dtype", "float64"),
+                                edge_weight_type=meta.get("edge_weight_type", "EUC_2D"), **arrays)
+
+
+def load_cvrp(file_path, distance_dtype="float64", use_cache=True, cache_dir=None, distance_mode="auto"):
+    """
+    Loads an instance, going through the on-disk binary cache when enabled.
+    On a cache miss the file is parsed, its distances set up and the arrays
+    stored, so the next call (from any process) only maps them.
+    :param file_path: Path to the CVRP instance file.
+    :param distance_dtype: One of DISTANCE_DTYPES.
+    :param use_cache: Set to False to always parse the file.
+    :param cache_dir: Cache folder; defaults to "<data folder>/.cache".
+    :param distance_mode: One of DISTANCE_MODES.
+    """
+    check_distance_options(distance_dtype, distance_mode)
+    if not use_cache:
+        return CVRPData(file_path, distance_dtype, distance_mode)
+
+    cache_path = instance_cache_path(file_path, distance_dtype, cache_dir)
+    cached = open_instance_cache(cache_path, distance_mode)
+    if cached is not None:
+        return cached
+    # A cache of another format version is stale: rebuild it
+    shutil.rmtree(cache_path, ignore_errors=True)
+
+    cvrp_data = CVRPData(file_path, distance_dtype, distance_mode)
+    save_instance_cache(cvrp_data, cache_path)
+    return open_instance_cache(cache_path, distance_mode) or cvrp_data
+
+
+def _load_for_directory(file_path, load_kwargs):
+    """Worker side of load_directory: parses (and caches) one instance."""
+    cvrp_data = load_cvrp(file_path, **load_kwargs)
+    # A cached instance is reopened (memory-mapped) by the parent, not pickled back
+    return None if load_kwargs.get("use_cache", True) else cvrp_data
+
+
+def load_directory(folder, workers=None, suffix=".vrp", skip_errors=False, **load_kwargs):
+    """
+    Loads every instance of a folder, parsing them concurrently.
+    Worker processes parse the files and fill the binary cache; the instances
+    are then memory-mapped from it here (or sent back when use_cache=False).
+    :param folder: Folder of instance files.
+    :param workers: Worker processes; None uses every core, 1 loads in-process.
+    :param suffix: Extension of the instance files.
+    :param skip_errors: Leave out (and report) files that fail to load
+                        instead of raising.
+    :param load_kwargs: load_cvrp kwargs (distance_dtype, use_cache, ...).
+    :return: {file name: CVRPData}, sorted by file name.
+    """
+    names = sorted(name for name in os.listdir(folder) if name.endswith(suffix))
+    paths = [os.path.join(folder, name) for name in names]
+    workers = workers or os.cpu_count()
+
+    if workers == 1:
+        outcomes = []
+        for path in paths:
+            try:
+                outcomes.append(load_cvrp(path, **load_kwargs))
+            except (OSError, ValueError) as error:
+                outcomes.append(error)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_load_for_directory, path, load_kwargs) for path in paths]
+            outcomes = []
+            for path, future in zip(paths, futures):
+                try:
+                    outcomes.append(future.result() or load_cvrp(path, **load_kwargs))
+                except (OSError, ValueError) as error:
+                    outcomes.append(error)
+
+    instances = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            if not skip_errors:
+                raise outcome
+            print(f"⚠️ Skipping {name}: {outcome}")
+        else:
+            instances[name] = outcome
+    return instances
+
+
 # Run the script with your file
 cvrp = CVRPData("data/A-n60-k9.vrp")  # Ensure the file is placed in "data/"
 cvrp.print_data()
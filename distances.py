@@ -0,0 +1,149 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Supported distance dtypes. "int32" follows the TSPLIB EUC_2D convention of
+# rounding every distance to the nearest integer.
+DISTANCE_DTYPES = ("float64", "float32", "int32")
+
+# How distances are provided: a dense (n + 1) x (n + 1) matrix, computed from
+# the coordinates on demand, or "auto" (dense while it fits DENSE_LIMIT_BYTES).
+DISTANCE_MODES = ("auto", "dense", "on_the_fly")
+DENSE_LIMIT_BYTES = 1 << 30
+
+# Rows of distances computed per broadcasting step; bounds the size of the
+# temporary (block x n) coordinate differences on large instances.
+DISTANCE_BLOCK_ROWS = 1024
+
+
+def check_distance_options(distance_dtype, distance_mode="dense"):
+    if distance_dtype not in DISTANCE_DTYPES:
+        raise ValueError(f"Unknown distance dtype {distance_dtype!r}, expected one of {DISTANCE_DTYPES}")
+    if distance_mode not in DISTANCE_MODES:
+        raise ValueError(f"Unknown distance mode {distance_mode!r}, expected one of {DISTANCE_MODES}")
+
+
+def resolve_distance_mode(distance_mode, num_nodes, distance_dtype):
+    """Turns "auto" into "dense" or "on_the_fly" from the size of the dense matrix."""
+    if distance_mode != "auto":
+        return distance_mode
+    dense_bytes = (num_nodes + 1) ** 2 * np.dtype(distance_dtype).itemsize
+    return "dense" if dense_bytes <= DENSE_LIMIT_BYTES else "on_the_fly"
+
+
+def dense_distance_matrix(coords, dtype="float64"):
+    """
+    Euclidean distance matrix indexed by node id (row/column 0 unused), built
+    block by block with broadcasting.
+    """
+    num_nodes = len(coords)
+    x = coords[:, 0]
+    y = coords[:, 1]
+    matrix = np.zeros((num_nodes + 1, num_nodes + 1), dtype=dtype)
+    for start in range(0, num_nodes, DISTANCE_BLOCK_ROWS):
+        stop = min(start + DISTANCE_BLOCK_ROWS, num_nodes)
+        block = np.hypot(x[start:stop, None] - x[None, :], y[start:stop, None] - y[None, :])
+        if dtype == "int32":
+            block = np.floor(block + 0.5)
+        matrix[start + 1:stop + 1, 1:] = block
+    return matrix
+
+
+def explicit_distance_matrix(weights, dtype="float64"):
+    """
+    Distance matrix indexed by node id (row/column 0 unused) from an (n, n)
+    matrix of given weights, e.g. TSPLIB EXPLICIT edge weights.
+    """
+    matrix = np.zeros((len(weights) + 1, len(weights) + 1), dtype=dtype)
+    if dtype == "int32":
+        weights = np.floor(np.asarray(weights, dtype=np.float64) + 0.5)
+    matrix[1:, 1:] = weights
+    return matrix
+
+
+class DenseDistances:
+    """
+    Distances read from a precomputed (n + 1) x (n + 1) matrix.
+
+    Every provider supports NumPy-style indexing by node ids, provider[i, j]
+    with scalars or broadcastable arrays, plus pair(i, j) for one distance as
+    a Python number and row(i) for the distances from i to every node id.
+    """
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.dtype = matrix.dtype
+        self.pair = matrix.item
+
+    def __getitem__(self, index):
+        return self.matrix[index]
+
+    def row(self, node):
+        return self.matrix[node]
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes
+
+
+class OnTheFlyDistances:
+    """
+    Distances computed from the coordinates when asked for, so memory stays
+    O(n). Full rows (used by nearest-neighbor scans) are kept in a small LRU.
+
+    Distances are sqrt(dx * dx + dy * dy) on both the array and the scalar
+    path, so the two agree bit for bit; they can differ from the dense
+    (np.hypot) matrix in the last bit, except in "int32" mode where both
+    round to the same integers.
+    """
+    def __init__(self, coords, dtype="float64", cache_rows=64):
+        """
+        :param coords: (n, 2) coordinates, row i is node i + 1.
+        :param dtype: One of DISTANCE_DTYPES.
+        :param cache_rows: Rows kept by row().
+        """
+        self.dtype = np.dtype(dtype)
+        # Node-id indexed coordinates (entry 0 unused)
+        self.x = np.concatenate(([0.0], np.asarray(coords[:, 0], dtype=np.float64)))
+        self.y = np.concatenate(([0.0], np.asarray(coords[:, 1], dtype=np.float64)))
+        self._x = self.x.tolist()
+        self._y = self.y.tolist()
+        self.cache_rows = cache_rows
+        self.rows = OrderedDict()
+
+    def _finish(self, distances):
+        if self.dtype == np.int32:
+            distances = np.floor(distances + 0.5)
+        return distances.astype(self.dtype, copy=False)
+
+    def __getitem__(self, index):
+        i, j = index
+        dx = self.x[i] - self.x[j]
+        dy = self.y[i] - self.y[j]
+        return self._finish(np.sqrt(dx * dx + dy * dy))
+
+    def pair(self, i, j):
+        dx = self._x[i] - self._x[j]
+        dy = self._y[i] - self._y[j]
+        distance = math.sqrt(dx * dx + dy * dy)
+        if self.dtype == np.int32:
+            return math.floor(distance + 0.5)
+        if self.dtype == np.float32:
+            return float(np.float32(distance))
+        return distance
+
+    def row(self, node):
+        row = self.rows.get(node)
+        if row is not None:
+            self.rows.move_to_end(node)
+            return row
+        row = self[node, slice(None)]
+        row[0] = 0
+        self.rows[node] = row
+        if len(self.rows) > self.cache_rows:
+            self.rows.popitem(last=False)
+        return row
+
+    @property
+    def nbytes(self):
+        return self.x.nbytes + self.y.nbytes + sum(row.nbytes for row in self.rows.values())
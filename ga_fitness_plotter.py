@@ -33,31 +33,19 @@ def main():
             crossover_prob=0.8,
             mutation_prob=0.1,
             mutation_type=cfg["mutation_type"],
-            crossover_type=cfg["crossover_type"]
+            crossover_type=cfg["crossover_type"],
+            telemetry=True
         )
 
-        # Evolve GA population and record stats
-        population = ga.initialize_population()
-        min_fitness, max_fitness, mean_fitness, std_fitness = [], [], [], []
-        for _ in range(generations):
-            fitnesses = [ga.evaluate_route(ind) for ind in population]
-            min_fitness.append(min(fitnesses))
-            max_fitness.append(max(fitnesses))
-            mean_fitness.append(np.mean(fitnesses))
-            std_fitness.append(np.std(fitnesses))
-            # Evolve population
-            new_population = []
-            for _ in range(population_size):
-                p1 = ga.tournament_selection(population, fitnesses)
-                p2 = ga.tournament_selection(population, fitnesses)
-                child = ga.crossover(p1, p2)
-                ga.mutate(child)
-                new_population.append(child)
-            population = new_population
+        # Per-generation statistics recorded by the solver itself (run 0)
+        telemetry = ga.run()["telemetry"]
+        min_fitness = telemetry["min"][0]
+        max_fitness = telemetry["max"][0]
+        mean_fitness = telemetry["mean"][0]
 
         # Smooth and plot fitness curves
         window = 5
-        gens = np.arange(1, generations + 1)
+        gens = np.arange(len(min_fitness))  # generation 0 is the initial population
         gens_sm = gens[window - 1:]
         min_sm = smooth(min_fitness, window)
         max_sm = smooth(max_fitness, window)
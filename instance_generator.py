@@ -0,0 +1,138 @@
+import argparse
+import math
+import os
+
+import numpy as np
+
+# Customer placement (depot placement is chosen separately)
+LAYOUTS = ("random", "clustered", "mixed")
+# Demand distributions, loosely following Uchoa et al. (2017)
+DEMANDS = ("unitary", "small", "large", "skewed")
+DEPOTS = ("center", "random", "corner")
+
+
+def place_customers(rng, num_customers, layout, grid_size):
+    """Integer customer coordinates (num_customers, 2) in [0, grid_size]."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}")
+    num_random = {"random": num_customers, "clustered": 0, "mixed": num_customers // 2}[layout]
+    num_clustered = num_customers - num_random
+
+    points = [rng.uniform(0, grid_size, size=(num_random, 2))]
+    if num_clustered:
+        num_seeds = int(rng.integers(3, 9))
+        seeds = rng.uniform(0, grid_size, size=(num_seeds, 2))
+        spread = grid_size / (4 * math.sqrt(num_seeds))
+        owner = rng.integers(num_seeds, size=num_clustered)
+        points.append(seeds[owner] + rng.normal(0, spread, size=(num_clustered, 2)))
+    coords = np.clip(np.rint(np.concatenate(points)), 0, grid_size).astype(np.int64)
+    return coords[rng.permutation(num_customers)]
+
+
+def draw_demands(rng, num_customers, demand):
+    if demand not in DEMANDS:
+        raise ValueError(f"Unknown demand distribution {demand!r}, expected one of {DEMANDS}")
+    if demand == "unitary":
+        return np.ones(num_customers, dtype=np.int64)
+    if demand == "small":
+        return rng.integers(1, 11, size=num_customers)
+    if demand == "large":
+        return rng.integers(5, 101, size=num_customers)
+    # skewed: mostly small demands with a few large ones
+    large = rng.random(num_customers) < 0.1
+    return np.where(large, rng.integers(50, 101, size=num_customers), rng.integers(1, 11, size=num_customers))
+
+
+def generate_instance(num_customers, layout="random", demand="small", customers_per_route=10,
+                      tightness=0.9, depot="center", grid_size=1000, seed=0):
+    """
+    Random CVRP instance; the same arguments always give the same instance.
+    :param num_customers: Number of customers (the depot is extra).
+    :param layout: One of LAYOUTS.
+    :param demand: One of DEMANDS.
+    :param customers_per_route: Average route length, which fixes the
+                                number of vehicles k = ceil(n / length).
+    :param tightness: Total demand / (k * capacity), in (0, 1]; 1 leaves no slack.
+    :param depot: One of DEPOTS.
+    :param grid_size: Coordinates are integers in [0, grid_size].
+    :param seed: Seed of the generator.
+    :return: Dict with 'name', 'coords' (depot first), 'demand' (depot first, 0),
+             'capacity' and 'vehicles'.
+    """
+    if depot not in DEPOTS:
+        raise ValueError(f"Unknown depot placement {depot!r}, expected one of {DEPOTS}")
+    if not 0 < tightness <= 1:
+        raise ValueError(f"tightness must be in (0, 1], got {tightness}")
+    rng = np.random.default_rng(seed)
+
+    depot_xy = {
+        "center": np.array([grid_size // 2, grid_size // 2]),
+        "corner": np.array([0, 0]),
+        "random": rng.integers(0, grid_size + 1, size=2),
+    }[depot]
+    customers = place_customers(rng, num_customers, layout, grid_size)
+    demands = draw_demands(rng, num_customers, demand)
+
+    vehicles = math.ceil(num_customers / customers_per_route)
+    capacity = max(int(demands.max()), math.ceil(int(demands.sum()) / (tightness * vehicles)))
+    vehicles = max(vehicles, math.ceil(int(demands.sum()) / capacity))
+
+    return {
+        "name": f"S-n{num_customers + 1}-k{vehicles}-{layout[0].upper()}{demand[0].upper()}-s{seed}",
+        "coords": np.vstack([depot_xy, customers]),
+        "demand": np.concatenate([[0], demands]),
+        "capacity": capacity,
+        "vehicles": vehicles,
+    }
+
+
+def write_vrp(file_path, instance, comment=None):
+    """Writes an instance from generate_instance() as a TSPLIB CVRP file."""
+    lines = [
+        f"NAME : {instance['name']}",
+        f"COMMENT : ({comment or 'Synthetic instance'}, No of trucks: {instance['vehicles']})",
+        "TYPE : CVRP",
+        f"DIMENSION : {len(instance['coords'])}",
+        "EDGE_WEIGHT_TYPE : EUC_2D",
+        f"CAPACITY : {instance['capacity']}",
+        "NODE_COORD_SECTION",
+    ]
+    lines += [f" {node_id} {x} {y}" for node_id, (x, y) in enumerate(instance["coords"].tolist(), 1)]
+    lines.append("DEMAND_SECTION")
+    lines += [f"{node_id} {d}" for node_id, d in enumerate(instance["demand"].tolist(), 1)]
+    lines += ["DEPOT_SECTION", " 1", " -1", "EOF"]
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def generate_file(folder, num_customers, **params):
+    """Generates an instance into `folder` and returns the path of the .vrp file."""
+    instance = generate_instance(num_customers, **params)
+    os.makedirs(folder, exist_ok=True)
+    file_path = os.path.join(folder, instance["name"] + ".vrp")
+    comment = ", ".join(f"{key}={value}" for key, value in sorted(params.items()))
+    write_vrp(file_path, instance, comment=f"Synthetic instance: {comment}")
+    return file_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic TSPLIB CVRP instances.")
+    parser.add_argument("sizes", nargs="+", type=int, help="Customer counts, one instance each")
+    parser.add_argument("--layout", choices=LAYOUTS, default="random")
+    parser.add_argument("--demand", choices=DEMANDS, default="small")
+    parser.add_argument("--customers-per-route", type=float, default=10)
+    parser.add_argument("--tightness", type=float, default=0.9)
+    parser.add_argument("--depot", choices=DEPOTS, default="center")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="data/synthetic")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        file_path = generate_file(args.output, size, layout=args.layout, demand=args.demand,
+                                  customers_per_route=args.customers_per_route,
+                                  tightness=args.tightness, depot=args.depot, seed=args.seed)
+        print(f"✅ {file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
+from algorithms.local_search import LocalSearch
+from algorithms.numpy_genetic_algorithm import NumpyGeneticAlgorithmCVRP
+from algorithms.random_algorithm import RandomSearchCVRP
+from algorithms.simulated_annealing import SimulatedAnnealingCVRP
+from algorithms.tabu_algorithm import TabuSearchCVRP
+from cvrp_solver import load_cvrp
+
+# name -> (solver class, method running one independent run)
+SOLVERS = {
+    "random": (RandomSearchCVRP, "run_multiple"),
+    "tabu": (TabuSearchCVRP, "run"),
+    "ga": (GeneticAlgorithmCVRP, "run"),
+    "ga_numpy": (NumpyGeneticAlgorithmCVRP, "run"),
+    "sa": (SimulatedAnnealingCVRP, "run"),
+}
+
+# Instances already loaded by this (worker) process, keyed by file path
+_loaded_instances = {}
+
+
+def task_seed(base_seed, instance_name, algorithm, run_index):
+    """
+    Deterministic seed of one (instance, algorithm, run) task. It depends only
+    on the task itself, never on which worker runs it or in which order.
+    """
+    key = [base_seed, zlib.crc32(instance_name.encode()), zlib.crc32(algorithm.encode()), run_index]
+    return int(np.random.SeedSequence(key).generate_state(1)[0])
+
+
+def _get_instance(file_path):
+    if file_path not in _loaded_instances:
+        _loaded_instances[file_path] = load_cvrp(file_path)
+    return _loaded_instances[file_path]
+
+
+# Small settings running every SOLVERS entry in a few seconds (see smoke_test)
+SMOKE_SETTINGS = {
+    "random": {"max_fitness_evals": 200},
+    "tabu": {"max_iterations": 10, "neighbor_sample_size": 20},
+    "ga": {"population_size": 10, "generations": 5},
+    "ga_numpy": {"population_size": 10, "generations": 5},
+    "sa": {"max_evaluations": 200},
+}
+
+
+def run_solver(solver, algorithm):
+    """
+    Runs one independent run of a constructed SOLVERS solver.
+    :return: (best cost, split routes, full result dict)
+    """
+    method = SOLVERS[algorithm][1]
+    result = getattr(solver, method)() if algorithm == "sa" else getattr(solver, method)(runs=1)
+    cost = result["best"] if "best" in result else result["best_cost"]
+    return cost, result["split_routes"], result
+
+
+def run_task(file_path, algorithm, params, seed, local_search=None):
+    """
+    Runs a single independent run of one solver with its own seeded RNG.
+    :param local_search: Optional LocalSearch kwargs; the run's routes are
+                         then polished to a local optimum.
+    :return: (best cost, split routes)
+    """
+    cvrp_data = _get_instance(file_path)
+    solver = SOLVERS[algorithm][0](cvrp_data, seed=seed, **params)
+    cost, routes, _ = run_solver(solver, algorithm)
+    if local_search is not None:
+        polished = LocalSearch(cvrp_data, **local_search).improve(routes)
+        cost, routes = polished["cost"], polished["split_routes"]
+    return cost, routes
+
+
+def aggregate(run_results):
+    """
+    Collapses per-run (cost, routes) pairs, in run order, into the stats
+    dictionary returned by the solvers.
+    """
+    costs = np.array([cost for cost, _ in run_results])
+    best_run = int(costs.argmin())
+    return {
+        "best": float(costs.min()),
+        "worst": float(costs.max()),
+        "avg": float(costs.mean()),
+        "std": float(costs.std()),
+
+        "split_routes": run_results[best_run][1]
+    }
+
+
+def run_parallel(instance_paths, algorithms, runs=10, workers=None, base_seed=0, local_search=None):
+    """
+    Fans out every (instance, algorithm, run) task over a process pool.
+    Every task is seeded from task_seed() and results are aggregated in run
+    order, so the returned stats are identical for any worker count.
+    :param instance_paths: Paths of .vrp files.
+    :param algorithms: {name: constructor kwargs} with names from SOLVERS.
+    :param runs: Independent runs per instance and algorithm.
+    :param workers: Worker processes; None uses every core, 1 runs in-process.
+    :param base_seed: Seed of the whole experiment.
+    :param local_search: Optional LocalSearch kwargs applied after every run.
+    :return: {(instance file name, algorithm): stats dict}
+    """
+    for algorithm in algorithms:
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {sorted(SOLVERS)}")
+
+    tasks = []
+    for file_path in instance_paths:
+        instance_name = os.path.basename(file_path)
+        for algorithm, params in algorithms.items():
+            for run_index in range(runs):
+                seed = task_seed(base_seed, instance_name, algorithm, run_index)
+                tasks.append(((instance_name, algorithm), (file_path, algorithm, params, seed, local_search)))
+
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        outcomes = [run_task(*args) for _, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_task, *args) for _, args in tasks]
+            outcomes = [future.result() for future in futures]
+
+    grouped = {}
+    for (key, _), outcome in zip(tasks, outcomes):
+        grouped.setdefault(key, []).append(outcome)
+    return {key: aggregate(run_results) for key, run_results in grouped.items()}
+
+
+def smoke_test(file_path="data/A-n32-k5.vrp"):
+    """Runs every SOLVERS entry once with SMOKE_SETTINGS and checks its routes."""
+    missing = set(SOLVERS) - set(SMOKE_SETTINGS)
+    assert not missing, f"No smoke settings for {sorted(missing)}"
+    cvrp_data = _get_instance(file_path)
+    for algorithm, params in SMOKE_SETTINGS.items():
+        for mode_params in ({"mode": "giant_tour"}, {"mode": "routes"}) if algorithm == "sa" else ({},):
+            cost, routes = run_task(file_path, algorithm, {**params, **mode_params}, seed=0)
+            visited = sorted(c for route in routes for c in route if c != 1)
+            assert visited == list(range(2, cvrp_data.num_nodes + 1)), f"{algorithm} routes miss customers"
+            label = " ".join([algorithm, *mode_params.values()])
+            print(f"✅ {label}: {cost:.2f}")
+
+
+if __name__ == "__main__":
+    smoke_test()
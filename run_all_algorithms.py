@@ -2,11 +2,21 @@ import os
 import csv
 import time
 
-from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
 from algorithms.greedy_algorithm import GreedyCVRP
-from algorithms.random_algorithm import RandomSearchCVRP
-from algorithms.tabu_algorithm import TabuSearchCVRP
-from cvrp_solver import CVRPData
+from algorithms.local_search import LocalSearch
+from cvrp_solver import load_cvrp
+from parallel_runner import run_parallel
+
+# Constructor arguments of the stochastic solvers, keyed by parallel_runner.SOLVERS names
+SOLVER_SETTINGS = {
+    "random": {"max_fitness_evals": 5000},
+    "tabu": {"max_iterations": 100, "neighbor_sample_size": 50},
+    "ga": {"population_size": 50, "generations": 100, "crossover_prob": 0.9, "mutation_prob": 0.1},
+}
+
+# LocalSearch kwargs polishing every run's routes (e.g. {"neighbors": 10}),
+# or None to report the raw solver results
+LOCAL_SEARCH = None
 
 
 def read_optimal_cost(file_path):
@@ -24,6 +34,9 @@ def main():
     DATA_FOLDER = "data"
     OPTIMAL_FOLDER = "data/optimal_data"
     RESULTS_CSV = "results/algorithm_comparison_results.csv"
+    RUNS = 10
+    WORKERS = os.cpu_count()  # set to 1 to run everything in this process
+    BASE_SEED = 0
 
     os.makedirs("results", exist_ok=True)
     vrp_files = [f for f in os.listdir(DATA_FOLDER) if f.endswith(".vrp")]
@@ -42,13 +55,22 @@ def main():
             "GA Best", "GA Worst", "GA Avg", "GA Std"
         ])
 
+    # Random Search, Tabu Search and GA runs are independent: fan them all out at once
+    print(f"\n⚙️ Running {RUNS} runs per solver on {WORKERS} workers...")
+    start = time.time()
+    solver_stats = run_parallel(
+        [os.path.join(DATA_FOLDER, f) for f in vrp_files], SOLVER_SETTINGS,
+        runs=RUNS, workers=WORKERS, base_seed=BASE_SEED, local_search=LOCAL_SEARCH
+    )
+    print(f"✅ Stochastic solvers Done in {time.time() - start:.2f}s")
+
     results = []
 
     for idx, file_name in enumerate(vrp_files, 1):
         print(f"\n🔄 Processing file {idx}/{len(vrp_files)}: {file_name}")
         file_path = os.path.join(DATA_FOLDER, file_name)
         optimal_file = os.path.join(OPTIMAL_FOLDER, file_name)
-        cvrp_data = CVRPData(file_path)
+        cvrp_data = load_cvrp(file_path)
         optimal_cost = read_optimal_cost(optimal_file)
 
         # Run Greedy
@@ -56,31 +78,14 @@ def main():
         start = time.time()
         greedy_solver = GreedyCVRP(cvrp_data)
         greedy_routes, greedy_distance = greedy_solver.run()
+        if LOCAL_SEARCH is not None:
+            polished = LocalSearch(cvrp_data, **LOCAL_SEARCH).improve(greedy_routes)
+            greedy_routes, greedy_distance = polished["split_routes"], polished["cost"]
         print(f"✅ Greedy Done in {time.time() - start:.2f}s")
 
-        # Run Random Search
-        print("➡️ Running Random Search...")
-        start = time.time()
-        random_solver = RandomSearchCVRP(cvrp_data, max_fitness_evals=5000)
-        rand_stats = random_solver.run_multiple(runs=10)
-        print(f"✅ Random Search Done in {time.time() - start:.2f}s")
-
-        # Run Tabu Search
-        print("➡️ Running Tabu Search...")
-        start = time.time()
-        tabu_solver = TabuSearchCVRP(cvrp_data, max_iterations=100, neighbor_sample_size=50)
-        tabu_stats = tabu_solver.run(runs=10)
-        print(f"✅ Tabu Search Done in {time.time() - start:.2f}s")
-
-        # Run Genetic Algorithm
-        print("➡️ Running Genetic Algorithm...")
-        start = time.time()
-        ga_solver = GeneticAlgorithmCVRP(
-            cvrp_data, population_size=50, generations=100,
-            crossover_prob=0.9, mutation_prob=0.1
-        )
-        ga_stats = ga_solver.run(runs=10)
-        print(f"✅ GA Done in {time.time() - start:.2f}s")
+        rand_stats = solver_stats[(file_name, "random")]
+        tabu_stats = solver_stats[(file_name, "tabu")]
+        ga_stats = solver_stats[(file_name, "ga")]
 
         # ✅ Append current file's results to best_routes.txt
         with open("results/best_routes.txt", "a", encoding="utf-8") as f:
@@ -0,0 +1,127 @@
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource  # Unix only; peak memory is reported as N/A elsewhere
+except ImportError:
+    resource = None
+
+from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
+from algorithms.greedy_algorithm import GreedyCVRP
+from algorithms.numpy_genetic_algorithm import NumpyGeneticAlgorithmCVRP
+from algorithms.random_algorithm import RandomSearchCVRP
+from algorithms.simulated_annealing import SimulatedAnnealingCVRP
+from algorithms.tabu_algorithm import TabuSearchCVRP
+from cvrp_solver import CVRPData, load_cvrp
+from distances import DISTANCE_DTYPES, DISTANCE_MODES
+from instance_generator import generate_file
+
+SYNTHETIC_FOLDER = "data/synthetic"
+RESULTS_CSV = "results/scaling_benchmark.csv"
+
+# Stage name -> (solver class, method, kwargs). Every metaheuristic gets a fixed
+# evaluation budget, so time versus n shows the cost per evaluation; the time
+# limit only keeps a hopeless size from running for hours.
+STAGES = {
+    "random": (RandomSearchCVRP, "run_multiple",
+               {"max_fitness_evals": 2000}),
+    "tabu": (TabuSearchCVRP, "run",
+             {"max_iterations": 10 ** 6, "neighbor_sample_size": 50, "max_evaluations": 2000}),
+    "tabu_granular": (TabuSearchCVRP, "run",
+                      {"granular": True, "max_iterations": 10 ** 6, "max_evaluations": 20000}),
+    "ga": (GeneticAlgorithmCVRP, "run",
+           {"population_size": 50, "generations": 10 ** 6, "max_evaluations": 2000}),
+    "ga_numpy": (NumpyGeneticAlgorithmCVRP, "run",
+                 {"population_size": 50, "generations": 10 ** 6, "max_evaluations": 2000}),
+    "sa": (SimulatedAnnealingCVRP, "run",
+           {"cooling_rate": 0.9999, "stopping_temp": 1e-3, "max_evaluations": 2000}),
+    "sa_routes": (SimulatedAnnealingCVRP, "run",
+                  {"mode": "routes", "cooling_rate": 0.9999, "stopping_temp": 1e-3,
+                   "max_evaluations": 20000}),
+}
+TIME_LIMIT = 600
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MiB, or None if unavailable."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def run_stage(file_path, stage, distance_dtype, distance_mode):
+    """
+    Runs one stage in the current (fresh) process.
+    :return: Dict with 'seconds', 'evaluations', 'stop_reason' and 'peak_rss_mb'.
+    """
+    if stage == "load":
+        start = time.perf_counter()
+        CVRPData(file_path, distance_dtype=distance_dtype, distance_mode=distance_mode)
+        return {"seconds": time.perf_counter() - start, "evaluations": None,
+                "stop_reason": "completed", "peak_rss_mb": peak_rss_mb()}
+
+    cvrp_data = load_cvrp(file_path, distance_dtype=distance_dtype, distance_mode=distance_mode)
+    if stage == "greedy":
+        start = time.perf_counter()
+        GreedyCVRP(cvrp_data).run()
+        return {"seconds": time.perf_counter() - start, "evaluations": None,
+                "stop_reason": "completed", "peak_rss_mb": peak_rss_mb()}
+
+    solver_class, method, params = STAGES[stage]
+    solver = solver_class(cvrp_data, seed=0, time_limit=TIME_LIMIT, **params)
+    start = time.perf_counter()
+    result = getattr(solver, method)() if method == "run" else getattr(solver, method)(runs=1)
+    return {"seconds": time.perf_counter() - start, "evaluations": result["evaluations"],
+            "stop_reason": result["stop_reason"], "peak_rss_mb": peak_rss_mb()}
+
+
+def measure(file_path, stage, distance_dtype, distance_mode):
+    """
+    Runs a stage in its own worker process, so its peak memory is not
+    inflated by earlier stages and a MemoryError only loses this stage.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(run_stage, file_path, stage, distance_dtype, distance_mode).result()
+        except Exception as error:  # e.g. MemoryError or a killed worker at large n
+            return {"seconds": None, "evaluations": None, "stop_reason": f"failed: {error!r}",
+                    "peak_rss_mb": None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory of every stage versus instance size.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 2000, 5000, 10000, 20000])
+    parser.add_argument("--stages", nargs="+", choices=["load", "greedy", *STAGES],
+                        default=["load", "greedy", *STAGES])
+    parser.add_argument("--layout", default="random")
+    parser.add_argument("--distance-dtype", choices=DISTANCE_DTYPES, default="float64")
+    parser.add_argument("--distance-mode", choices=DISTANCE_MODES, default="auto")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs("results", exist_ok=True)
+    with open(RESULTS_CSV, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Customers", "Stage", "Seconds", "Evaluations", "Evals/s", "Peak RSS MiB", "Stop Reason"])
+
+    for size in args.sizes:
+        file_path = generate_file(SYNTHETIC_FOLDER, size, layout=args.layout, seed=args.seed)
+        print(f"\n📦 n={size}: {file_path}")
+        for stage in args.stages:
+            row = measure(file_path, stage, args.distance_dtype, args.distance_mode)
+            rate = row["evaluations"] / row["seconds"] if row["evaluations"] and row["seconds"] else None
+            print(f"  {stage:<14} "
+                  + (f"{row['seconds']:.3f}s" if row["seconds"] is not None else "N/A")
+                  + (f" evals/s={rate:.0f}" if rate else "")
+                  + (f" peak={row['peak_rss_mb']:.0f}MiB" if row["peak_rss_mb"] is not None else "")
+                  + f" [{row['stop_reason']}]")
+            with open(RESULTS_CSV, mode="a", newline="") as file:
+                csv.writer(file).writerow([size, stage, row["seconds"], row["evaluations"], rate,
+                                           row["peak_rss_mb"], row["stop_reason"]])
+
+
+if __name__ == "__main__":
+    main()
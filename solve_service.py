@@ -0,0 +1,244 @@
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from cvrp_solver import CVRPData, load_cvrp
+from parallel_runner import SOLVERS, run_solver
+
+DATA_FOLDER = "data"
+# Finished jobs kept for polling; the oldest are forgotten first
+MAX_FINISHED_JOBS = 10000
+
+# Per-worker state, set up once by _init_worker
+_instances = OrderedDict()
+_instance_cache_size = 8
+_progress = None
+
+
+def _init_worker(cache_size, progress_queue):
+    global _instance_cache_size, _progress
+    _instance_cache_size = cache_size
+    _progress = progress_queue
+
+
+def _get_instance(key, spec):
+    """
+    CVRPData for a request, from this worker's LRU when it was used recently.
+    :return: (CVRPData, whether it came from the LRU)
+    """
+    if key in _instances:
+        _instances.move_to_end(key)
+        return _instances[key], True
+    if "path" in spec:
+        cvrp_data = load_cvrp(spec["path"], distance_dtype=spec.get("distance_dtype", "float64"))
+    else:
+        cvrp_data = CVRPData.from_arrays(np.asarray(spec["coords"], dtype=np.float64),
+                                         np.asarray(spec["demand"], dtype=np.int64),
+                                         spec["capacity"],
+                                         distance_dtype=spec.get("distance_dtype", "float64"))
+    _instances[key] = cvrp_data
+    if len(_instances) > _instance_cache_size:
+        _instances.popitem(last=False)
+    return cvrp_data, False
+
+
+def solve(job_id, instance_key, instance_spec, algorithm, params):
+    """Runs one solve in a warm worker; new best-so-far costs go to the progress queue."""
+    cvrp_data, cached = _get_instance(instance_key, instance_spec)
+
+    def report(best):
+        if _progress is not None:
+            _progress.put((job_id, {key: best[key] for key in ("cost", "elapsed", "evaluations")}))
+
+    solver = SOLVERS[algorithm][0](cvrp_data, callback=report, **params)
+    cost, routes, result = run_solver(solver, algorithm)
+    return {
+        "cost": cost,
+        "routes": routes,
+        "evaluations": result["evaluations"],
+        "elapsed": result["elapsed"],
+        "stop_reason": result["stop_reason"],
+        "instance_cached": cached,
+        "worker_pid": os.getpid(),
+    }
+
+
+class SolveService:
+    """
+    Accepts solve jobs, runs them on a pool of warm worker processes (imports
+    done, recently used instances kept per worker) and tracks their state
+    for polling.
+    """
+    def __init__(self, workers=None, cache_size=8, data_folder=DATA_FOLDER):
+        """
+        :param workers: Worker processes; None uses every core.
+        :param cache_size: Instances kept in each worker's LRU.
+        :param data_folder: Instances may be named relative to this folder
+                            and must lie inside it.
+        """
+        self.data_folder = os.path.realpath(data_folder)
+        self.progress = multiprocessing.Queue()
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(cache_size, self.progress))
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.job_ids = itertools.count(1)
+        threading.Thread(target=self._drain_progress, daemon=True).start()
+
+    def _drain_progress(self):
+        while True:
+            item = self.progress.get()
+            if item is None:
+                return
+            job_id, best = item
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is not None and job["status"] in ("queued", "running"):
+                    job["best_so_far"] = best
+                    job["status"] = "running"
+
+    def instance(self, request):
+        """:return: (cache key, spec passed to the worker) for a request."""
+        distance_dtype = request.get("distance_dtype", "float64")
+        if "instance" in request:
+            path = os.path.realpath(os.path.join(self.data_folder, request["instance"]))
+            if os.path.commonpath([path, self.data_folder]) != self.data_folder or not os.path.isfile(path):
+                raise ValueError(f"Unknown instance {request['instance']!r}")
+            return f"{path}:{distance_dtype}", {"path": path, "distance_dtype": distance_dtype}
+        if "data" in request:
+            data = request["data"]
+            spec = {"coords": data["coords"], "demand": data["demand"], "capacity": data["capacity"],
+                    "distance_dtype": distance_dtype}
+            return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest(), spec
+        raise ValueError("A request needs either 'instance' or 'data'")
+
+    def submit(self, request):
+        """
+        Queues a solve request:
+        {"instance": "A-n32-k5.vrp" | "data": {"coords", "demand", "capacity"},
+         "algorithm": one of parallel_runner.SOLVERS, "params": {...},
+         "time_limit": s, "max_evaluations": n, "seed": int}
+        :return: Job id.
+        """
+        algorithm = request.get("algorithm")
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {sorted(SOLVERS)}")
+        params = dict(request.get("params", {}))
+        for key in ("time_limit", "max_evaluations", "seed"):
+            if key in request:
+                params[key] = request[key]
+        key, spec = self.instance(request)
+
+        job_id = str(next(self.job_ids))
+        with self.lock:
+            self.jobs[job_id] = {"status": "queued", "submitted": time.time()}
+        future = self.executor.submit(solve, job_id, key, spec, algorithm, params)
+        future.add_done_callback(lambda done: self._finish(job_id, done))
+        return job_id
+
+    def _finish(self, job_id, future):
+        with self.lock:
+            job = self.jobs[job_id]
+            try:
+                job["result"] = future.result()
+                job["status"] = "done"
+            except Exception as error:
+                job["error"] = repr(error)
+                job["status"] = "failed"
+            job["finished"] = time.time()
+            finished = [jid for jid, j in self.jobs.items() if j["status"] in ("done", "failed")]
+            for old_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self.jobs[old_id]
+
+    def job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return None if job is None else {"job_id": job_id, **job}
+
+    def wait(self, job_id, timeout=None, poll_interval=0.01):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.job(job_id)
+            if job is None or job["status"] in ("done", "failed"):
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def shutdown(self):
+        self.executor.shutdown()
+        self.progress.put(None)
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /solve          queue a job (add "wait": true to block for the result)
+    GET  /jobs/<id>      poll a job: status, best_so_far, result or error
+    GET  /health         liveness check
+    """
+    service = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send(200, {"status": "ok"})
+        if self.path.startswith("/jobs/"):
+            job = self.service.job(self.path[len("/jobs/"):])
+            return self._send(200, job) if job else self._send(404, {"error": "unknown job"})
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/solve":
+            return self._send(404, {"error": "not found"})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            job_id = self.service.submit(request)
+        except (ValueError, KeyError, TypeError) as error:
+            return self._send(400, {"error": str(error)})
+        if request.get("wait"):
+            return self._send(200, self.service.wait(job_id, request.get("wait_timeout")))
+        self._send(202, {"job_id": job_id, "status": "queued"})
+
+    def log_message(self, format, *args):
+        pass  # one line per poll would drown the console
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local CVRP solve service with warm worker processes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=8, help="Instances kept per worker")
+    args = parser.parse_args()
+
+    SolveRequestHandler.service = SolveService(args.workers, args.cache_size)
+    server = ThreadingHTTPServer((args.host, args.port), SolveRequestHandler)
+    print(f"🚀 Solve service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        SolveRequestHandler.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
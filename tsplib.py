@@ -0,0 +1,244 @@
+import numpy as np
+
+# Edge weight types CVRPData can use: Euclidean distances from the node
+# coordinates, or a matrix given in EDGE_WEIGHT_SECTION.
+EDGE_WEIGHT_TYPES = ("EUC_2D", "EXPLICIT")
+
+# EDGE_WEIGHT_FORMAT -> (row, column) indices of its values, in file order.
+# Matrices are symmetric, so a column-wise format lists the same entries as
+# the transposed row-wise one.
+EDGE_WEIGHT_FORMATS = {
+    "FULL_MATRIX": lambda n: np.indices((n, n)).reshape(2, -1),
+    "UPPER_ROW": lambda n: np.triu_indices(n, 1),
+    "LOWER_ROW": lambda n: np.tril_indices(n, -1),
+    "UPPER_DIAG_ROW": lambda n: np.triu_indices(n),
+    "LOWER_DIAG_ROW": lambda n: np.tril_indices(n),
+    "UPPER_COL": lambda n: np.tril_indices(n, -1)[::-1],
+    "LOWER_COL": lambda n: np.triu_indices(n, 1)[::-1],
+    "UPPER_DIAG_COL": lambda n: np.tril_indices(n)[::-1],
+    "LOWER_DIAG_COL": lambda n: np.triu_indices(n)[::-1],
+}
+
+
+class TSPLIBInstance:
+    """
+    A CVRP instance as read from a TSPLIB file, with the depot moved to the
+    first row. Arrays are 0-based: row i belongs to node_ids[i] in the file.
+    """
+    def __init__(self, specification, coords, demand, node_ids, edge_weights=None):
+        """
+        :param specification: {KEY: value} of the specification part.
+        :param coords: (n, 2) float64 coordinates (NaN when only explicit
+                       weights are given).
+        :param demand: (n,) int64 demands.
+        :param node_ids: (n,) original node ids.
+        :param edge_weights: Optional (n, n) float64 matrix of EXPLICIT weights.
+        """
+        self.specification = specification
+        self.coords = coords
+        self.demand = demand
+        self.node_ids = node_ids
+        self.edge_weights = edge_weights
+
+    @property
+    def name(self):
+        return self.specification.get("NAME", "")
+
+    @property
+    def capacity(self):
+        return int(self.specification["CAPACITY"])
+
+    @property
+    def edge_weight_type(self):
+        return self.specification.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+
+
+class _Reader:
+    """Line-by-line TSPLIB reader keeping the line number for error messages."""
+    def __init__(self, file, path):
+        self.file = file
+        self.path = path
+        self.line_number = 0
+        self.pending = None
+
+    def next_line(self):
+        """Next non-empty line as a list of tokens, or None at the end of the file."""
+        if self.pending is not None:
+            line, self.pending = self.pending, None
+            return line
+        for line in self.file:
+            self.line_number += 1
+            parts = line.split()
+            if parts:
+                return parts
+        return None
+
+    def push_back(self, parts):
+        self.pending = parts
+
+    def error(self, message):
+        return ValueError(f"{self.path}:{self.line_number}: {message}")
+
+
+def _is_keyword(token):
+    return token[0].isalpha()
+
+
+def _read_node_rows(reader, dimension, columns, dtype, fill, name):
+    """
+    Rows "node_id value..." of a section, until the next keyword, written
+    into an array preallocated from DIMENSION (collected first when the file
+    does not declare it).
+    :return: ((n, columns) array whose row i is node i + 1, number of rows read)
+    """
+    array = None if dimension is None else np.full((dimension, columns), fill, dtype=dtype)
+    rows = {}
+    count = 0
+    while True:
+        parts = reader.next_line()
+        if parts is None or _is_keyword(parts[0]):
+            reader.push_back(parts)
+            break
+        if len(parts) < columns + 1:
+            raise reader.error(f"{name} expects a node id and {columns} value(s)")
+        try:
+            node_id = int(parts[0])
+            values = [dtype(value) for value in parts[1:columns + 1]]
+        except ValueError:
+            raise reader.error(f"Malformed {name} line {' '.join(parts)!r}") from None
+        if node_id < 1 or (dimension is not None and node_id > dimension):
+            raise reader.error(f"Node id {node_id} outside 1..{dimension or 'n'}")
+        if array is None:
+            rows[node_id] = values
+        else:
+            array[node_id - 1] = values
+        count += 1
+
+    if array is None:
+        array = np.full((max(rows, default=0), columns), fill, dtype=dtype)
+        for node_id, values in rows.items():
+            array[node_id - 1] = values
+    return array, count
+
+
+def _read_edge_weights(reader, dimension, weight_format):
+    """Values of EDGE_WEIGHT_SECTION (which may wrap lines) as a full symmetric matrix."""
+    if dimension is None:
+        raise reader.error("EDGE_WEIGHT_SECTION needs DIMENSION")
+    if weight_format not in EDGE_WEIGHT_FORMATS:
+        raise reader.error(f"Unsupported EDGE_WEIGHT_FORMAT {weight_format!r}, "
+                           f"expected one of {sorted(EDGE_WEIGHT_FORMATS)}")
+    rows, cols = EDGE_WEIGHT_FORMATS[weight_format](dimension)
+    values = np.empty(len(rows), dtype=np.float64)
+    count = 0
+    while count < len(values):
+        parts = reader.next_line()
+        if parts is None or _is_keyword(parts[0]):
+            raise reader.error(f"EDGE_WEIGHT_SECTION ended after {count} of {len(values)} values")
+        if count + len(parts) > len(values):
+            raise reader.error(f"EDGE_WEIGHT_SECTION has more than {len(values)} values")
+        try:
+            values[count:count + len(parts)] = [float(value) for value in parts]
+        except ValueError:
+            raise reader.error(f"Malformed EDGE_WEIGHT_SECTION line {' '.join(parts)!r}") from None
+        count += len(parts)
+
+    weights = np.zeros((dimension, dimension), dtype=np.float64)
+    weights[rows, cols] = values
+    weights[cols, rows] = values
+    return weights
+
+
+def _read_depots(reader):
+    depots = []
+    while True:
+        parts = reader.next_line()
+        if parts is None or _is_keyword(parts[0]):
+            reader.push_back(parts)
+            return depots
+        for token in parts:
+            try:
+                depot = int(token)
+            except ValueError:
+                raise reader.error(f"Malformed DEPOT_SECTION line {' '.join(parts)!r}") from None
+            if depot == -1:
+                return depots
+            depots.append(depot)
+
+
+def read_tsplib(path):
+    """
+    Streams a TSPLIB CVRP file section by section.
+
+    Supports specification lines "KEY : value" (with or without spaces
+    around the colon), NODE_COORD_SECTION with integer or float coordinates
+    (a third coordinate is ignored), DISPLAY_DATA_SECTION as coordinates of
+    explicit instances, EDGE_WEIGHT_SECTION in every EDGE_WEIGHT_FORMAT,
+    DEMAND_SECTION and DEPOT_SECTION. The declared depot (node 1 if none is
+    declared) is moved to the first row; node_ids keeps the original ids.
+    :raises ValueError: On malformed, inconsistent or unsupported input, with
+                        the file name and line number.
+    """
+    specification = {}
+    coords = display = demand = None
+    depots = []
+    edge_weights = None
+
+    with open(path, "r") as file:
+        reader = _Reader(file, path)
+        while True:
+            parts = reader.next_line()
+            if parts is None or parts[0] == "EOF":
+                break
+            keyword = parts[0].rstrip(":").upper()
+            dimension = int(specification["DIMENSION"]) if "DIMENSION" in specification else None
+            if keyword == "NODE_COORD_SECTION":
+                coords, coord_count = _read_node_rows(reader, dimension, 2, np.float64, np.nan, keyword)
+            elif keyword == "DISPLAY_DATA_SECTION":
+                display, _ = _read_node_rows(reader, dimension, 2, np.float64, np.nan, keyword)
+            elif keyword == "DEMAND_SECTION":
+                demand, _ = _read_node_rows(reader, dimension, 1, np.int64, 0, keyword)
+            elif keyword == "DEPOT_SECTION":
+                depots = _read_depots(reader)
+            elif keyword == "EDGE_WEIGHT_SECTION":
+                edge_weights = _read_edge_weights(reader, dimension,
+                                                  specification.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"))
+            elif keyword.endswith("_SECTION"):
+                raise reader.error(f"Unsupported section {keyword}")
+            else:
+                key, _, value = " ".join(parts).partition(":")
+                if not value and len(parts) > 1:
+                    key, value = parts[0], " ".join(parts[1:])
+                specification[key.strip().upper()] = value.strip()
+
+        weight_type = specification.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+        if weight_type not in EDGE_WEIGHT_TYPES:
+            raise reader.error(f"Unsupported EDGE_WEIGHT_TYPE {weight_type!r}, expected one of {EDGE_WEIGHT_TYPES}")
+        if "CAPACITY" not in specification:
+            raise reader.error("Missing CAPACITY")
+        if weight_type == "EXPLICIT" and edge_weights is None:
+            raise reader.error("EDGE_WEIGHT_TYPE EXPLICIT without EDGE_WEIGHT_SECTION")
+        if coords is None:
+            if weight_type != "EXPLICIT":
+                raise reader.error("Missing NODE_COORD_SECTION")
+            coords = display if display is not None else np.full((len(edge_weights), 2), np.nan)
+        elif coord_count != len(coords):
+            raise reader.error(f"NODE_COORD_SECTION has {coord_count} of {len(coords)} nodes")
+        dimension = len(coords)
+        if len(depots) > 1:
+            raise reader.error(f"Multiple depots {depots} are not supported")
+        depot = depots[0] if depots else 1
+        if not 1 <= depot <= dimension:
+            raise reader.error(f"Depot {depot} outside 1..{dimension}")
+
+    demand_column = np.zeros(dimension, dtype=np.int64)
+    if demand is not None:
+        demand_column[:len(demand)] = demand[:dimension, 0]
+    demand = demand_column
+    node_ids = np.arange(1, dimension + 1, dtype=np.int64)
+    if depot != 1:
+        order = np.concatenate(([depot - 1], np.delete(np.arange(dimension), depot - 1)))
+        coords, demand, node_ids = coords[order], demand[order], node_ids[order]
+        if edge_weights is not None:
+            edge_weights = edge_weights[np.ix_(order, order)]
+    return TSPLIBInstance(specification, coords, demand, node_ids, edge_weights)
@@ -1,8 +1,23 @@
-
 import os
 import csv
-from algorithms.genetic_algorithm import GeneticAlgorithmCVRP
-from cvrp_solver import CVRPData
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from parallel_runner import run_task, task_seed
+
+# Joint search space of the GA settings
+SEARCH_SPACE = {
+    "population_size": [30, 50, 100],
+    "generations": [1500, 3000, 5000],
+    "crossover_prob": [0.7, 0.8, 0.9],
+    "mutation_prob": [0.05, 0.1, 0.2],
+    "mutation_type": ["swap", "inversion", "insertion"],
+    "crossover_type": ["OX", "PMX", "ERX"],
+}
+
 
 def read_optimal_cost(file_path):
     try:
@@ -14,11 +29,68 @@ def read_optimal_cost(file_path):
         return None
     return None
 
+
+def sample_configs(count, seed=0):
+    """`count` distinct configurations drawn uniformly from SEARCH_SPACE."""
+    keys = list(SEARCH_SPACE)
+    grid = list(itertools.product(*SEARCH_SPACE.values()))
+    return [dict(zip(keys, values)) for values in random.Random(seed).sample(grid, min(count, len(grid)))]
+
+
+def rung_schedule(max_runs, eta, num_configs):
+    """
+    Cumulative runs per configuration at every successive-halving rung, e.g.
+    [1, 3, 10] for max_runs=10, eta=3 and 27 configurations.
+    """
+    rungs = max(1, int(round(np.log(num_configs) / np.log(eta))) + 1)
+    schedule = [max(1, round(max_runs / eta ** (rungs - 1 - k))) for k in range(rungs)]
+    schedule[-1] = max_runs
+    return sorted(set(schedule))
+
+
+def successive_halving(executor, file_path, configs, max_runs, eta, base_seed, on_rung):
+    """
+    Races the configurations on one instance. Every rung tops each surviving
+    configuration up to the rung's number of runs (all runs of a rung execute
+    in parallel), then keeps the best 1/eta by average cost. Run i of every
+    configuration uses the same seed, so configurations are compared on the
+    same random streams.
+    :param on_rung: Called with (rung index, [(config, costs)]) after every rung.
+    :return: (best config, its costs)
+    """
+    instance_name = os.path.basename(file_path)
+    costs = [[] for _ in configs]
+    alive = list(range(len(configs)))
+    schedule = rung_schedule(max_runs, eta, len(configs))
+
+    for rung, runs in enumerate(schedule, 1):
+        futures = {}
+        for index in alive:
+            for run_index in range(len(costs[index]), runs):
+                seed = task_seed(base_seed, instance_name, "ga", run_index)
+                future = executor.submit(run_task, file_path, "ga", configs[index], seed)
+                futures.setdefault(index, []).append(future)
+        for index, pending in futures.items():
+            costs[index].extend(future.result()[0] for future in pending)
+
+        alive.sort(key=lambda index: np.mean(costs[index]))
+        on_rung(rung, [(configs[index], costs[index]) for index in alive])
+        if rung < len(schedule):
+            alive = alive[:max(1, len(alive) // eta)]
+
+    best = alive[0]
+    return configs[best], costs[best]
+
+
 def main():
     DATA_FOLDER = "data"
     OPTIMAL_FOLDER = "data/optimal_data"
     INSTANCES = ["A-n32-k5.vrp", "A-n60-k9.vrp"]
-    RUNS_PER_CONFIG = 10
+    RUNS_PER_CONFIG = 10  # runs given to the finalists
+    NUM_CONFIGS = 27
+    ETA = 3  # keep the best 1/ETA configurations at every rung
+    WORKERS = os.cpu_count()
+    BASE_SEED = 0
 
     os.makedirs("results", exist_ok=True)
     result_file = "results/ga_tuning_stepwise.csv"
@@ -28,106 +100,34 @@ def main():
         writer.writerow(["Step", "Instance", "Optimal", "Population", "Generations", "Mutation Type",
                          "Crossover Type", "Best", "Worst", "Avg", "Std"])
 
-    for instance in INSTANCES:
-        file_path = os.path.join(DATA_FOLDER, instance)
-        optimal_path = os.path.join(OPTIMAL_FOLDER, instance)
-        cvrp_data = CVRPData(file_path)
-        optimal_cost = read_optimal_cost(optimal_path) or "N/A"
-
-        print(f"📦 Instance: {instance}")
-        print("🔬 Step 1: Tuning Population Size")
-
-        # Step 1: Tune Population Size
-        step1_configs = [
-            {"population_size": 30, "generations": 5000, "mutation_type": "swap", "crossover_type": "OX"},
-            {"population_size": 50, "generations": 3000, "mutation_type": "swap", "crossover_type": "OX"},
-            {"population_size": 100, "generations": 1500, "mutation_type": "swap", "crossover_type": "OX"}
-        ]
-        step = 1
-        best_config = None
-        best_avg = float('inf')
-
-        for config in step1_configs:
-            solver = GeneticAlgorithmCVRP(cvrp_data,
-                                          population_size=config["population_size"],
-                                          generations=config["generations"],
-                                          crossover_prob=0.7,
-                                          mutation_prob=0.1,
-                                          mutation_type=config["mutation_type"],
-                                          crossover_type=config["crossover_type"])
-            stats = solver.run(runs=RUNS_PER_CONFIG)
-            print(f"POP={config['population_size']} | AVG={stats['avg']:.2f}")
-            if stats["avg"] < best_avg:
-                best_avg = stats["avg"]
-                best_config = config
-
-            with open(result_file, mode="a", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow([f"Step {step}", instance, optimal_cost, config["population_size"],
-                                 config["generations"], config["mutation_type"], config["crossover_type"],
-                                 stats["best"], stats["worst"], stats["avg"], stats["std"]])
-
-        print("🔬 Step 2: Tuning Mutation Type")
-
-        # Step 2: Tune Mutation Type
-        step2_configs = [
-            {**best_config, "mutation_type": "swap"},
-            {**best_config, "mutation_type": "inversion"}
-        ]
-        step += 1
-        best_avg = float('inf')
-
-        for config in step2_configs:
-            solver = GeneticAlgorithmCVRP(cvrp_data,
-                                          population_size=config["population_size"],
-                                          generations=config["generations"],
-                                          crossover_prob=0.8,
-                                          mutation_prob=0.1,
-                                          mutation_type=config["mutation_type"],
-                                          crossover_type=config["crossover_type"])
-            stats = solver.run(runs=RUNS_PER_CONFIG)
-            print(f"MUT={config['mutation_type']} | AVG={stats['avg']:.2f}")
-            if stats["avg"] < best_avg:
-                best_avg = stats["avg"]
-                best_config = config
-
-            with open(result_file, mode="a", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow([f"Step {step}", instance, optimal_cost, config["population_size"],
-                                 config["generations"], config["mutation_type"], config["crossover_type"],
-                                 stats["best"], stats["worst"], stats["avg"], stats["std"]])
-
-        print("🔬 Step 3: Tuning Crossover Type")
-
-        # Step 3: Tune Crossover Type
-        step3_configs = [
-            {**best_config, "crossover_type": "OX"},
-            {**best_config, "crossover_type": "PMX"}
-        ]
-        step += 1
-        best_avg = float('inf')
-
-        for config in step3_configs:
-            solver = GeneticAlgorithmCVRP(cvrp_data,
-                                          population_size=config["population_size"],
-                                          generations=config["generations"],
-                                          crossover_prob=0.8,
-                                          mutation_prob=0.1,
-                                          mutation_type=config["mutation_type"],
-                                          crossover_type=config["crossover_type"])
-            stats = solver.run(runs=RUNS_PER_CONFIG)
-            print(f"XO={config['crossover_type']} | AVG={stats['avg']:.2f}")
-            if stats["avg"] < best_avg:
-                best_avg = stats["avg"]
-                best_config = config
-
-            with open(result_file, mode="a", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow([f"Step {step}", instance, optimal_cost, config["population_size"],
-                                 config["generations"], config["mutation_type"], config["crossover_type"],
-                                 stats["best"], stats["worst"], stats["avg"], stats["std"]])
-
-        print(f"✅ Best Final Config for {instance}: {best_config}\n")
+    with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+        for instance in INSTANCES:
+            file_path = os.path.join(DATA_FOLDER, instance)
+            optimal_path = os.path.join(OPTIMAL_FOLDER, instance)
+            optimal_cost = read_optimal_cost(optimal_path) or "N/A"
+            configs = sample_configs(NUM_CONFIGS, seed=BASE_SEED)
+
+            print(f"📦 Instance: {instance}")
+            print(f"🏁 Racing {len(configs)} configurations on {WORKERS} workers")
+
+            def write_rung(rung, ranked):
+                print(f"🔬 Rung {rung}: {len(ranked)} configurations, {len(ranked[0][1])} runs each")
+                with open(result_file, mode="a", newline="") as file:
+                    writer = csv.writer(file)
+                    for config, costs in ranked:
+                        arr = np.array(costs)
+                        print(f"POP={config['population_size']} GEN={config['generations']} "
+                              f"CX={config['crossover_prob']} MUT={config['mutation_prob']} "
+                              f"{config['mutation_type']}/{config['crossover_type']} | AVG={arr.mean():.2f}")
+                        # Probabilities have no column of their own; keep them in the step label
+                        writer.writerow([f"Rung {rung} (cx={config['crossover_prob']}, mut={config['mutation_prob']})",
+                                         instance, optimal_cost, config["population_size"],
+                                         config["generations"], config["mutation_type"], config["crossover_type"],
+                                         float(arr.min()), float(arr.max()), float(arr.mean()), float(arr.std())])
+
+            best_config, _ = successive_halving(executor, file_path, configs, RUNS_PER_CONFIG, ETA,
+                                                BASE_SEED, write_rung)
+            print(f"✅ Best Final Config for {instance}: {best_config}\n")
 
 if __name__ == "__main__":
     main()